@@ -235,13 +235,16 @@ class AgentConfigurator(ABC):
         logger.info(f">>> {self.__class__.__name__}.handle_configuration() STARTED")
         logger.info(f"User: {self.user_id}, Message length: {len(message)}")
 
+        # Lowercase once and share it with every toolkit config's keyword checks
+        message_lower = message.lower()
+
         # Phase 1: Try to extract configuration from message
         logger.info("🔄 Phase 1: Attempting to extract configuration from message")
         for config in self.toolkit_configs:
             logger.debug(f"Checking {config.__class__.__name__} for extractable config...")
 
             try:
-                confirmation = config.extract_and_store_config(message, self.user_id)
+                confirmation = config.extract_and_store_config(message, self.user_id, message_lower=message_lower)
             except ValueError as e:
                 # Invalid configuration (e.g., invalid color)
                 error_msg = f"❌ Configuration Error: {str(e)}"
@@ -282,7 +285,7 @@ class AgentConfigurator(ABC):
                 config_name = config.__class__.__name__
                 logger.debug(f"  Checking optional toolkit {config_name}...")
 
-                auth_prompt = config.check_authorization_request(message, self.user_id)
+                auth_prompt = config.check_authorization_request(message, self.user_id, message_lower=message_lower)
                 if auth_prompt:
                     logger.info(f"Optional toolkit {config_name} detected authorization request")
                     logger.debug(f"Auth prompt: {auth_prompt[:100]}...")
@@ -1,5 +1,6 @@
 """Base agent wrapper class for LiteLLM integration with configurator pattern."""
 
+import asyncio
 import json
 import os
 from abc import ABC, abstractmethod
@@ -327,8 +328,9 @@ class BaseAgentWrapper(ABC):
         logger.info(f">>> {self.__class__.__name__}._arun_non_streaming() STARTED")
         logger.info(f"user_id={user_id}, session_id={session_id}")
 
-        # Check configuration
-        config_response = self._configurator.handle_configuration(message)
+        # Check configuration in a worker thread: token validation and OAuth code
+        # exchange make blocking network calls that would otherwise stall the event loop
+        config_response = await asyncio.to_thread(self._configurator.handle_configuration, message)
 
         if config_response is not None:
             self._invalidate_agent_cache()
@@ -411,8 +413,9 @@ class BaseAgentWrapper(ABC):
         logger.info(f">>> {self.__class__.__name__}._arun_streaming() STARTED")
         logger.info(f"user_id={user_id}, session_id={session_id}")
 
-        # Check configuration
-        config_response = self._configurator.handle_configuration(message)
+        # Check configuration in a worker thread: token validation and OAuth code
+        # exchange make blocking network calls that would otherwise stall the event loop
+        config_response = await asyncio.to_thread(self._configurator.handle_configuration, message)
 
         if config_response is not None:
             self._invalidate_agent_cache()
@@ -466,9 +469,8 @@ class BaseAgentWrapper(ABC):
             try:
                 async for chunk in stream:
                     chunk_count += 1
-                    chunk_type = type(chunk).__name__
 
-                    logger.debug(f"Received event #{chunk_count}: type={chunk_type}")
+                    logger.debug("Received event #{}: type={}", chunk_count, type(chunk).__name__)
 
                     if isinstance(chunk, RunContentEvent):
                         # Handle Gemini native thinking content
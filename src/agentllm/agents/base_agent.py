@@ -284,6 +284,9 @@ class BaseAgentWrapper(ABC):
             logger.debug("=" * 80)
             return None
 
+        # Lowercase once and share it with every toolkit config's keyword checks
+        message_lower = message.lower()
+
         # Phase 1: Try to extract and store configuration from message
         logger.info("📝 Phase 1: Attempting to extract configuration from message")
         for config in self.toolkit_configs:
@@ -291,7 +294,7 @@ class BaseAgentWrapper(ABC):
             logger.debug(f"  Checking {config_name}...")
 
             try:
-                confirmation = config.extract_and_store_config(message, user_id)
+                confirmation = config.extract_and_store_config(message, user_id, message_lower=message_lower)
                 if confirmation:
                     logger.info(f"✅ {config_name} extracted and stored configuration")
                     logger.debug(safe_log_content(confirmation, "Confirmation message"))
@@ -345,7 +348,7 @@ class BaseAgentWrapper(ABC):
                 config_name = config.__class__.__name__
                 logger.debug(f"  Checking optional toolkit {config_name}...")
 
-                auth_prompt = config.check_authorization_request(message, user_id)
+                auth_prompt = config.check_authorization_request(message, user_id, message_lower=message_lower)
                 if auth_prompt:
                     logger.info(f"Optional toolkit {config_name} detected authorization request")
                     logger.debug(f"Auth prompt: {auth_prompt[:100]}...")
@@ -733,11 +736,7 @@ class BaseAgentWrapper(ABC):
                 "index": 0,
                 "is_finished": False,
                 "tool_use": None,
-                "usage": {
-                    "completion_tokens": 0,
-                    "prompt_tokens": 0,
-                    "total_tokens": 0,
-                },
+                "usage": {"completion_tokens": 0, "prompt_tokens": 0, "total_tokens": 0},
             }
 
             # Yield final chunk
@@ -747,11 +746,7 @@ class BaseAgentWrapper(ABC):
                 "index": 0,
                 "is_finished": True,
                 "tool_use": None,
-                "usage": {
-                    "completion_tokens": 0,
-                    "prompt_tokens": 0,
-                    "total_tokens": 0,
-                },
+                "usage": {"completion_tokens": 0, "prompt_tokens": 0, "total_tokens": 0},
             }
 
             logger.info(f"<<< {self.__class__.__name__}._arun_streaming() FINISHED (config response)")
@@ -769,11 +764,7 @@ class BaseAgentWrapper(ABC):
                 "index": 0,
                 "is_finished": False,
                 "tool_use": None,
-                "usage": {
-                    "completion_tokens": 0,
-                    "prompt_tokens": 0,
-                    "total_tokens": 0,
-                },
+                "usage": {"completion_tokens": 0, "prompt_tokens": 0, "total_tokens": 0},
             }
 
             # Yield final chunk
@@ -783,11 +774,7 @@ class BaseAgentWrapper(ABC):
                 "index": 0,
                 "is_finished": True,
                 "tool_use": None,
-                "usage": {
-                    "completion_tokens": 0,
-                    "prompt_tokens": 0,
-                    "total_tokens": 0,
-                },
+                "usage": {"completion_tokens": 0, "prompt_tokens": 0, "total_tokens": 0},
             }
 
             logger.info(f"<<< {self.__class__.__name__}._arun_streaming() FINISHED (error)")
@@ -827,9 +814,8 @@ class BaseAgentWrapper(ABC):
             try:
                 async for chunk in stream:
                     chunk_count += 1
-                    chunk_type = type(chunk).__name__
 
-                    logger.debug(f"[base_agent] Received event #{chunk_count} from agent: type={chunk_type}")
+                    logger.debug("[base_agent] Received event #{} from agent: type={}", chunk_count, type(chunk).__name__)
 
                     # Process different Agno event types and convert to LiteLLM format
 
@@ -846,7 +832,9 @@ class BaseAgentWrapper(ABC):
                             # Accumulate reasoning content
                             reasoning_content_parts.append(chunk.reasoning_content)
                             logger.debug(
-                                f"Accumulated reasoning content part #{len(reasoning_content_parts)}, length={len(chunk.reasoning_content)}"
+                                "Accumulated reasoning content part #{}, length={}",
+                                len(reasoning_content_parts),
+                                len(chunk.reasoning_content),
                             )
 
                             # Don't yield yet - we're accumulating for complete block
@@ -856,7 +844,7 @@ class BaseAgentWrapper(ABC):
                         content = chunk.content if hasattr(chunk, "content") else str(chunk)
 
                         if not content:
-                            logger.debug(f"Skipping empty RunContentEvent #{chunk_count}")
+                            logger.debug("Skipping empty RunContentEvent #{}", chunk_count)
                             continue
 
                         # If we have accumulated reasoning and haven't sent the block yet, send it now
@@ -889,17 +877,13 @@ class BaseAgentWrapper(ABC):
                                 "index": 0,
                                 "is_finished": False,
                                 "tool_use": None,
-                                "usage": {
-                                    "completion_tokens": 0,
-                                    "prompt_tokens": 0,
-                                    "total_tokens": 0,
-                                },
+                                "usage": {"completion_tokens": 0, "prompt_tokens": 0, "total_tokens": 0},
                             }
 
                             reasoning_block_sent = True
 
                         # Now yield regular content
-                        logger.debug(f"Yielding RunContentEvent #{chunk_count}, content_length={len(content)}")
+                        logger.debug("Yielding RunContentEvent #{}, content_length={}", chunk_count, len(content))
 
                         yield {
                             "text": content,
@@ -907,11 +891,7 @@ class BaseAgentWrapper(ABC):
                             "index": 0,
                             "is_finished": False,
                             "tool_use": None,
-                            "usage": {
-                                "completion_tokens": 0,
-                                "prompt_tokens": 0,
-                                "total_tokens": 0,
-                            },
+                            "usage": {"completion_tokens": 0, "prompt_tokens": 0, "total_tokens": 0},
                         }
 
                     elif isinstance(chunk, ToolCallStartedEvent):
@@ -945,11 +925,7 @@ class BaseAgentWrapper(ABC):
                                 "index": 0,
                                 "is_finished": False,
                                 "tool_use": None,
-                                "usage": {
-                                    "completion_tokens": 0,
-                                    "prompt_tokens": 0,
-                                    "total_tokens": 0,
-                                },
+                                "usage": {"completion_tokens": 0, "prompt_tokens": 0, "total_tokens": 0},
                             }
                         else:
                             logger.warning(f"ToolCallCompletedEvent #{chunk_count} has no tool attribute, skipping")
@@ -978,14 +954,10 @@ class BaseAgentWrapper(ABC):
                                 "index": 0,
                                 "is_finished": False,
                                 "tool_use": None,
-                                "usage": {
-                                    "completion_tokens": 0,
-                                    "prompt_tokens": 0,
-                                    "total_tokens": 0,
-                                },
+                                "usage": {"completion_tokens": 0, "prompt_tokens": 0, "total_tokens": 0},
                             }
                         else:
-                            logger.debug(f"ReasoningStepEvent #{chunk_count} has no content, skipping")
+                            logger.debug("ReasoningStepEvent #{} has no content, skipping", chunk_count)
 
                     elif isinstance(chunk, RunCompletedEvent):
                         # RunCompletedEvent signals proper stream end
@@ -995,7 +967,7 @@ class BaseAgentWrapper(ABC):
 
                     else:
                         # Log other events for debugging (e.g., RunStartedEvent, etc.)
-                        logger.debug(f"Received event: {chunk_type} (not yielding)")
+                        logger.debug("Received event: {} (not yielding)", type(chunk).__name__)
 
                 logger.info(f"Stream iteration complete, total events processed: {chunk_count}")
 
@@ -1036,11 +1008,7 @@ class BaseAgentWrapper(ABC):
                 "index": 0,
                 "is_finished": False,
                 "tool_use": None,
-                "usage": {
-                    "completion_tokens": 0,
-                    "prompt_tokens": 0,
-                    "total_tokens": 0,
-                },
+                "usage": {"completion_tokens": 0, "prompt_tokens": 0, "total_tokens": 0},
             }
 
             # Yield final chunk
@@ -1050,11 +1018,7 @@ class BaseAgentWrapper(ABC):
                 "index": 0,
                 "is_finished": True,
                 "tool_use": None,
-                "usage": {
-                    "completion_tokens": 0,
-                    "prompt_tokens": 0,
-                    "total_tokens": 0,
-                },
+                "usage": {"completion_tokens": 0, "prompt_tokens": 0, "total_tokens": 0},
             }
 
             logger.info(f"<<< {self.__class__.__name__}._arun_streaming() FINISHED (exception)")
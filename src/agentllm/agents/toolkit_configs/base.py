@@ -5,13 +5,36 @@ Each toolkit (Google Drive, Jira, etc.) implements this interface to handle
 its own configuration flow and toolkit provisioning.
 """
 
+import re
 from abc import ABC, abstractmethod
+from functools import cache
 from typing import TYPE_CHECKING, Any
 
 if TYPE_CHECKING:
     from agentllm.db import TokenStorage
 
 
+@cache
+def _keyword_value_patterns(config_name: str) -> tuple[re.Pattern[str], ...]:
+    """Compile the "<name> is VALUE" patterns for a configuration name.
+
+    Underscores in the name also match a space or a hyphen, so "github_token"
+    matches "github token", "github-token" and "github_token".
+
+    Args:
+        config_name: Configuration name (e.g., "github_token")
+
+    Returns:
+        Compiled patterns, in priority order
+    """
+    name = "[ _-]".join(re.escape(part) for part in config_name.split("_"))
+    return (
+        re.compile(rf"(?:my\s+)?{name}\s+(?:is|=|:)\s+([^\s]+)", re.IGNORECASE),
+        re.compile(rf"set\s+{name}\s+to\s+([^\s]+)", re.IGNORECASE),
+        re.compile(rf"{name}:\s*([^\s]+)", re.IGNORECASE),
+    )
+
+
 class BaseToolkitConfig(ABC):
     """Abstract base class for toolkit configuration managers.
 
@@ -67,7 +90,7 @@ class BaseToolkitConfig(ABC):
         pass
 
     @abstractmethod
-    def extract_and_store_config(self, message: str, user_id: str) -> str | None:
+    def extract_and_store_config(self, message: str, user_id: str, message_lower: str | None = None) -> str | None:
         """Try to extract configuration from user message and store it.
 
         This method should:
@@ -79,6 +102,8 @@ class BaseToolkitConfig(ABC):
         Args:
             message: User message that may contain configuration
             user_id: User identifier
+            message_lower: The message lowercased once by the caller and
+                shared across configs (see _message_lower)
 
         Returns:
             Confirmation message if config was extracted and stored,
@@ -117,7 +142,7 @@ class BaseToolkitConfig(ABC):
         pass
 
     @abstractmethod
-    def check_authorization_request(self, message: str, user_id: str) -> str | None:
+    def check_authorization_request(self, message: str, user_id: str, message_lower: str | None = None) -> str | None:
         """Check if message requests this toolkit and handle authorization.
 
         This method should:
@@ -128,6 +153,8 @@ class BaseToolkitConfig(ABC):
         Args:
             message: User message
             user_id: User identifier
+            message_lower: The message lowercased once by the caller and
+                shared across configs (see _message_lower)
 
         Returns:
             Authorization prompt if user needs to authorize,
@@ -149,6 +176,41 @@ class BaseToolkitConfig(ABC):
         """
         return False
 
+    @staticmethod
+    def _message_lower(message: str, message_lower: str | None = None) -> str:
+        """Get a lowercased copy of a user message.
+
+        The configurator lowercases each message once and passes the result
+        to every toolkit config, so they don't each make their own copy.
+
+        Args:
+            message: User message text
+            message_lower: The message already lowercased by the caller, if any
+
+        Returns:
+            Lowercased message
+        """
+        return message.lower() if message_lower is None else message_lower
+
+    def _extract_keyword_value(self, message: str, config_name: str) -> str | None:
+        """Extract a value given for a configuration name in a user message.
+
+        Recognizes "my <name> is VALUE", "<name> = VALUE", "set <name> to VALUE"
+        and "<name>: VALUE".
+
+        Args:
+            message: User message text
+            config_name: Configuration name (e.g., "jira_token")
+
+        Returns:
+            Extracted value or None if not found
+        """
+        for pattern in _keyword_value_patterns(config_name):
+            match = pattern.search(message)
+            if match:
+                return match.group(1)
+        return None
+
     def get_agent_instructions(self, user_id: str) -> list[str]:
         """Get agent instructions based on toolkit configuration.
 
@@ -14,6 +14,50 @@ from agentllm.utils.logging import safe_log_content
 
 from .base import BaseToolkitConfig
 
+# Config names that require agent recreation, with and without underscore
+_RECREATE_CONFIG_NAMES = frozenset({"favorite_color", "favoritecolor"})
+
+# Color extraction patterns, tried in priority order, with a description for logging
+_COLOR_PATTERNS = (
+    (re.compile(r"(?:my\s+)?favorite\s+color\s+(?:is|=|:)\s+(\w+)", re.IGNORECASE), "my favorite color is X"),
+    (re.compile(r"I\s+(?:like|love|prefer)\s+(\w+)", re.IGNORECASE), "I like/love X"),
+    (re.compile(r"(?:set|configure)\s+color\s+(?:to\s+)?(\w+)", re.IGNORECASE), "set color to X"),
+    (re.compile(r"color\s*[:=]\s*(\w+)", re.IGNORECASE), "color: X"),
+)
+
+# ColorTools class, imported lazily on first use (see _get_color_tools_cls)
+_ColorTools = None
+
+# Explicit requests to reconfigure the color
+_RECONFIGURE_PATTERN = re.compile(r"(?:change|update|reconfigure|reset).*color", re.IGNORECASE)
+
+
+def _get_color_tools_cls():
+    """Import ColorTools once per process and return the class.
+
+    The import is deferred so that loading this config does not pull in the
+    agentllm.tools package until a toolkit is actually needed.
+    """
+    global _ColorTools
+    if _ColorTools is None:
+        from agentllm.tools.color_toolkit import ColorTools
+
+        _ColorTools = ColorTools
+    return _ColorTools
+
+
+# Agent instruction templates; %s is replaced with the user's color
+_INSTRUCTION_TEMPLATES = (
+    "The user's favorite color is %s.",
+    "When relevant to the conversation, incorporate references to %s.",
+)
+_COLOR_TOOLS_INSTRUCTION = "Use the color tools to generate palettes and themes based on this preference."
+
+
+def _build_instructions(color: str) -> tuple[str, ...]:
+    """Build the agent instructions for a color."""
+    return tuple(template % color for template in _INSTRUCTION_TEMPLATES) + (_COLOR_TOOLS_INSTRUCTION,)
+
 
 class FavoriteColorConfig(BaseToolkitConfig):
     """
@@ -41,6 +85,10 @@ class FavoriteColorConfig(BaseToolkitConfig):
         "white",
         "brown",
     ]
+    VALID_COLORS_STR = ", ".join(VALID_COLORS)
+
+    # Agent instructions pre-built for every supported color
+    _INSTRUCTIONS_BY_COLOR = {color: _build_instructions(color) for color in VALID_COLORS}
 
     def __init__(self, token_storage=None):
         """
@@ -49,16 +97,14 @@ class FavoriteColorConfig(BaseToolkitConfig):
         Args:
             token_storage: TokenStorage instance for persistent storage
         """
-        logger.debug("=" * 80)
         logger.debug("FavoriteColorConfig.__init__() called")
         super().__init__(token_storage)
 
         # Store token_storage for database persistence
         self.token_storage = token_storage
 
-        logger.debug(f"Initialized with valid colors: {', '.join(self.VALID_COLORS)}")
+        logger.debug(f"Initialized with valid colors: {self.VALID_COLORS_STR}")
         logger.debug(f"Token storage: {type(token_storage).__name__ if token_storage else 'None'}")
-        logger.debug("=" * 80)
 
     def is_required(self) -> bool:
         """
@@ -80,13 +126,23 @@ class FavoriteColorConfig(BaseToolkitConfig):
         Returns:
             True if color is stored in database, False otherwise
         """
-        logger.debug("=" * 80)
-        logger.debug(f"is_configured() called for user_id={user_id}")
+        return self._load_status(user_id)[0]
+
+    def _load_status(self, user_id: str) -> tuple[bool, str | None]:
+        """
+        Load the user's configuration status and color with a single query.
+
+        Args:
+            user_id: User identifier
+
+        Returns:
+            Tuple of (configured, color); color is None when not configured
+        """
+        logger.debug(f"_load_status() called for user_id={user_id}")
 
         if not self.token_storage:
             logger.warning("No token storage available, cannot check configuration")
-            logger.debug("=" * 80)
-            return False
+            return False, None
 
         # Check database for stored color
         color = self.token_storage.get_favorite_color(user_id)
@@ -97,12 +153,11 @@ class FavoriteColorConfig(BaseToolkitConfig):
         else:
             logger.info(f"User {user_id} is NOT configured yet")
 
-        logger.debug(f"is_configured() returning: {configured}")
-        logger.debug("=" * 80)
+        logger.debug(f"_load_status() returning: ({configured}, {color})")
 
-        return configured
+        return configured, color
 
-    def extract_and_store_config(self, message: str, user_id: str) -> str | None:
+    def extract_and_store_config(self, message: str, user_id: str, message_lower: str | None = None) -> str | None:
         """
         Extract favorite color from user message and store it.
 
@@ -115,6 +170,7 @@ class FavoriteColorConfig(BaseToolkitConfig):
         Args:
             message: User's message
             user_id: User identifier
+            message_lower: Lowercased message shared by the caller (see _message_lower)
 
         Returns:
             Confirmation message if color found and stored, None otherwise
@@ -122,7 +178,6 @@ class FavoriteColorConfig(BaseToolkitConfig):
         Raises:
             ValueError: If color is invalid
         """
-        logger.debug("=" * 80)
         logger.info(f">>> extract_and_store_config() STARTED - user_id={user_id}")
         logger.debug(safe_log_content(message, "Message to analyze"))
 
@@ -132,17 +187,15 @@ class FavoriteColorConfig(BaseToolkitConfig):
         if not color:
             logger.debug("No color pattern found in message")
             logger.info("<<< extract_and_store_config() FINISHED (no color found)")
-            logger.debug("=" * 80)
             return None
 
         logger.info(f"Extracted color candidate: '{color}'")
 
         # Validate color
         if color not in self.VALID_COLORS:
-            error_msg = f"Invalid color '{color}'. Supported colors: {', '.join(self.VALID_COLORS)}"
+            error_msg = f"Invalid color '{color}'. Supported colors: {self.VALID_COLORS_STR}"
             logger.warning(f"Color validation failed: {error_msg}")
             logger.info("<<< extract_and_store_config() FINISHED (validation error)")
-            logger.debug("=" * 80)
             raise ValueError(error_msg)
 
         logger.info(f"✅ Color '{color}' is valid")
@@ -152,7 +205,6 @@ class FavoriteColorConfig(BaseToolkitConfig):
             error_msg = "❌ No token storage available, cannot save configuration"
             logger.error(error_msg)
             logger.info("<<< extract_and_store_config() FINISHED (storage error)")
-            logger.debug("=" * 80)
             raise ValueError(error_msg)
 
         success = self.token_storage.upsert_favorite_color(user_id, color)
@@ -161,7 +213,6 @@ class FavoriteColorConfig(BaseToolkitConfig):
             error_msg = "❌ Failed to save favorite color to database"
             logger.error(error_msg)
             logger.info("<<< extract_and_store_config() FINISHED (database error)")
-            logger.debug("=" * 80)
             raise ValueError(error_msg)
 
         logger.info(f"✅ Stored color '{color}' in database for user {user_id}")
@@ -174,7 +225,6 @@ class FavoriteColorConfig(BaseToolkitConfig):
         )
 
         logger.info("<<< extract_and_store_config() FINISHED (success)")
-        logger.debug("=" * 80)
 
         return confirmation
 
@@ -190,37 +240,12 @@ class FavoriteColorConfig(BaseToolkitConfig):
         """
         logger.debug("_extract_color_from_message() called")
 
-        # Pattern 1: "my favorite color is X"
-        pattern1 = r"(?:my\s+)?favorite\s+color\s+(?:is|=|:)\s+(\w+)"
-        match = re.search(pattern1, message, re.IGNORECASE)
-        if match:
-            color = match.group(1).lower()
-            logger.debug(f"Pattern 1 matched: '{color}' (my favorite color is X)")
-            return color
-
-        # Pattern 2: "I like X" or "I love X"
-        pattern2 = r"I\s+(?:like|love|prefer)\s+(\w+)"
-        match = re.search(pattern2, message, re.IGNORECASE)
-        if match:
-            color = match.group(1).lower()
-            logger.debug(f"Pattern 2 matched: '{color}' (I like/love X)")
-            return color
-
-        # Pattern 3: "set color to X" or "configure color X"
-        pattern3 = r"(?:set|configure)\s+color\s+(?:to\s+)?(\w+)"
-        match = re.search(pattern3, message, re.IGNORECASE)
-        if match:
-            color = match.group(1).lower()
-            logger.debug(f"Pattern 3 matched: '{color}' (set color to X)")
-            return color
-
-        # Pattern 4: "color: X" or "color = X"
-        pattern4 = r"color\s*[:=]\s*(\w+)"
-        match = re.search(pattern4, message, re.IGNORECASE)
-        if match:
-            color = match.group(1).lower()
-            logger.debug(f"Pattern 4 matched: '{color}' (color: X)")
-            return color
+        for pattern, description in _COLOR_PATTERNS:
+            match = pattern.search(message)
+            if match:
+                color = match.group(1).lower()
+                logger.debug(f"Pattern matched: '{color}' ({description})")
+                return color
 
         logger.debug("No color pattern matched")
         return None
@@ -235,12 +260,10 @@ class FavoriteColorConfig(BaseToolkitConfig):
         Returns:
             Configuration prompt if not configured, None if already configured
         """
-        logger.debug("=" * 80)
         logger.debug(f"get_config_prompt() called for user_id={user_id}")
 
         if self.is_configured(user_id):
             logger.debug("User already configured, returning None")
-            logger.debug("=" * 80)
             return None
 
         prompt = (
@@ -252,12 +275,11 @@ class FavoriteColorConfig(BaseToolkitConfig):
             "- 'My favorite color is blue'\n"
             "- 'I like green'\n"
             "- 'Set color to red'\n\n"
-            f"**Supported colors:** {', '.join(self.VALID_COLORS)}\n\n"
+            f"**Supported colors:** {self.VALID_COLORS_STR}\n\n"
             "_(This demonstrates how agents can require configuration before proceeding)_"
         )
 
         logger.info(f"Returning configuration prompt for user {user_id}")
-        logger.debug("=" * 80)
 
         return prompt
 
@@ -275,21 +297,15 @@ class FavoriteColorConfig(BaseToolkitConfig):
         """
         logger.debug(f"get_toolkit() called for user_id={user_id}")
 
-        if not self.is_configured(user_id):
+        configured, favorite_color = self._load_status(user_id)
+        if not configured:
             logger.debug(f"User {user_id} not configured, returning None")
             return None
 
-        favorite_color = self.get_user_color(user_id)
-        if favorite_color:
-            logger.info(f"Creating ColorTools for user {user_id} with color={favorite_color}")
-            from agentllm.tools.color_toolkit import ColorTools
+        logger.info(f"Creating ColorTools for user {user_id} with color={favorite_color}")
+        return _get_color_tools_cls()(favorite_color=favorite_color)
 
-            return ColorTools(favorite_color=favorite_color)
-
-        logger.warning(f"User {user_id} configured but color is None, returning None")
-        return None
-
-    def check_authorization_request(self, message: str, user_id: str) -> str | None:
+    def check_authorization_request(self, message: str, user_id: str, message_lower: str | None = None) -> str | None:
         """
         Check if message is requesting color configuration.
 
@@ -300,6 +316,7 @@ class FavoriteColorConfig(BaseToolkitConfig):
         Args:
             message: User's message
             user_id: User identifier
+            message_lower: Lowercased message shared by the caller (see _message_lower)
 
         Returns:
             Configuration prompt if request detected, None otherwise
@@ -308,17 +325,9 @@ class FavoriteColorConfig(BaseToolkitConfig):
 
         # Since this is required config, we don't need special detection
         # But we can still detect explicit requests to reconfigure
-        reconfigure_patterns = [
-            r"change.*color",
-            r"update.*color",
-            r"reconfigure.*color",
-            r"reset.*color",
-        ]
-
-        for pattern in reconfigure_patterns:
-            if re.search(pattern, message, re.IGNORECASE):
-                logger.info(f"Detected reconfiguration request for user {user_id}")
-                return self.get_config_prompt(user_id)
+        if _RECONFIGURE_PATTERN.search(message):
+            logger.info(f"Detected reconfiguration request for user {user_id}")
+            return self.get_config_prompt(user_id)
 
         logger.debug("No authorization request detected")
         return None
@@ -335,31 +344,18 @@ class FavoriteColorConfig(BaseToolkitConfig):
         Returns:
             List of instruction strings
         """
-        logger.debug("=" * 80)
         logger.debug(f"get_agent_instructions() called for user_id={user_id}")
 
-        if not self.is_configured(user_id):
+        configured, color = self._load_status(user_id)
+        if not configured:
             logger.debug("User not configured, returning empty instructions")
-            logger.debug("=" * 80)
-            return []
-
-        # Retrieve color from database
-        color = self.get_user_color(user_id)
-
-        if not color:
-            logger.warning(f"User {user_id} is configured but color retrieval failed")
-            logger.debug("=" * 80)
             return []
 
-        instructions = [
-            f"The user's favorite color is {color}.",
-            f"When relevant to the conversation, incorporate references to {color}.",
-            "Use the color tools to generate palettes and themes based on this preference.",
-        ]
+        prebuilt = self._INSTRUCTIONS_BY_COLOR.get(color)
+        instructions = list(prebuilt if prebuilt is not None else _build_instructions(color))
 
         logger.info(f"Returning {len(instructions)} instructions for user {user_id}")
         logger.debug(f"Instructions: {instructions}")
-        logger.debug("=" * 80)
 
         return instructions
 
@@ -402,8 +398,7 @@ class FavoriteColorConfig(BaseToolkitConfig):
         logger.debug(f"requires_agent_recreation() called for config: {config_name}")
 
         # Recreate agent when favorite color is configured/changed
-        # Accept both "favorite_color" and "favoritecolor" (without underscore)
-        should_recreate = config_name in ["favorite_color", "favoritecolor"]
+        should_recreate = config_name in _RECREATE_CONFIG_NAMES
 
         logger.debug(f"Returning: {should_recreate}")
         return should_recreate
@@ -1,19 +1,90 @@
 """Google Drive OAuth configuration manager."""
 
-import json
+import math
 import os
 import re
+import threading
+import time
+from collections import OrderedDict
+from datetime import UTC
+from typing import TYPE_CHECKING, Any
 
-from google.auth.transport.requests import Request
-from google.oauth2.credentials import Credentials
-from google_auth_oauthlib.flow import Flow
-from googleapiclient.discovery import build
 from loguru import logger
 
-from agentllm.tools.gdrive_toolkit import GoogleDriveTools
-
 from .base import BaseToolkitConfig
 
+# The Google auth, OAuth flow and Drive discovery clients and GoogleDriveTools
+# pull in a large import graph, so they are imported inside the methods that
+# use them rather than being loaded with this module
+if TYPE_CHECKING:
+    from google.oauth2.credentials import Credentials
+
+    from agentllm.tools.gdrive_toolkit import GoogleDriveTools
+
+# orjson is an optional, faster drop-in for parsing stored token JSON
+try:
+    from orjson import loads as _json_loads
+except ImportError:
+    from json import loads as _json_loads
+
+# Refresh access tokens in the background once they are this close to expiry,
+# so the refresh round-trip does not land on a user request
+_REFRESH_AHEAD_SECS = 5 * 60
+
+# Refresh inline, on the request path, once an access token is this close to expiry
+_EXPIRY_SKEW_SECS = 10
+
+# Bounds on the per-user credential/toolkit caches. Evicted users are reloaded
+# from storage on their next request.
+_MAX_CACHED_USERS = 10_000
+_CACHE_IDLE_SECS = 24 * 60 * 60
+
+# How long cached credentials are used before checking that the stored token
+# still exists and hasn't been replaced by another process
+_STORAGE_RECHECK_SECS = 5 * 60
+
+# Authorization code in a redirect URL or code parameter:
+# http://localhost?code=4/... or http://localhost/?code=4/...
+_URL_CODE_RE = re.compile(r"(?:https?://[^\s]*[?&])?code=([^&\s]+)", re.IGNORECASE)
+
+# Natural language authorization code patterns
+_NL_CODE_RES = (
+    # "my google drive code is 4/..."
+    re.compile(
+        r"(?:my\s+)?(?:google\s+drive|gdrive|drive)\s+(?:auth\s+)?code\s+(?:is|=|:)\s+([^\s]+)",
+        re.IGNORECASE,
+    ),
+    # "set google drive code to 4/..."
+    re.compile(r"set\s+(?:google\s+drive|gdrive|drive)\s+code\s+to\s+([^\s]+)", re.IGNORECASE),
+)
+
+# Standalone Google OAuth authorization codes, which typically:
+# - Start with "4/"
+# - Are followed by many alphanumeric characters, underscores, hyphens
+_STANDALONE_CODE_RE = re.compile(r"(?:^|\s)(4/[A-Za-z0-9_\-\.]+)(?:\s|$)")
+
+# Keywords indicating the user is asking about Google Drive
+_GDRIVE_KEYWORDS = ("google drive", "gdrive", "google doc", "google sheet", "google slides", "drive.google.com")
+_GDRIVE_KEYWORDS_RE = re.compile("|".join(map(re.escape, _GDRIVE_KEYWORDS)), re.IGNORECASE)
+
+# Authorization prompt shown to users without Google Drive credentials
+_OAUTH_PROMPT = (
+    "🔐 **Google Drive Authorization Required**\n\n"
+    "{intro}:\n\n"
+    "1. **Visit this URL**: {oauth_url}\n"
+    "2. Sign in and authorize the application\n"
+    "3. After authorizing, you'll be redirected to a page that won't load\n"
+    "4. **Copy the entire URL** from your browser's address bar\n"
+    "   It will look like: `http://localhost?code=4/0AeaYSHB...`\n"
+    "5. **Paste the URL here** (or just the code starting with '4/')\n\n"
+    "{outro}"
+)
+
+# Shown instead of _OAUTH_PROMPT when OAuth client credentials are missing
+_OAUTH_NOT_CONFIGURED_PROMPT = (
+    "❌ {error}\n\nGoogle Drive integration requires OAuth credentials to be configured. Please contact your administrator."
+)
+
 
 class GoogleDriveConfig(BaseToolkitConfig):
     """Google Drive OAuth configuration manager.
@@ -74,9 +145,44 @@ class GoogleDriveConfig(BaseToolkitConfig):
             "https://www.googleapis.com/auth/presentations.readonly",
         ]
 
+        # OAuth client config shared by every Flow (None if OAuth is not configured)
+        self._gdrive_client_config = (
+            {
+                "installed": {
+                    "client_id": self._gdrive_client_id,
+                    "client_secret": self._gdrive_client_secret,
+                    "auth_uri": "https://accounts.google.com/o/oauth2/auth",
+                    "token_uri": "https://oauth2.googleapis.com/token",
+                    "redirect_uris": [self._gdrive_redirect_uri],
+                }
+            }
+            if self._gdrive_client_id and self._gdrive_client_secret
+            else None
+        )
+
         # Store per-user Google Drive toolkits (in-memory cache)
         self._gdrive_toolkits: dict[str, GoogleDriveTools] = {}
 
+        # Live credentials per user, shared with the user's toolkit, along with
+        # whether they are backed by legacy in-memory storage
+        self._gdrive_creds: dict[str, tuple[Credentials, bool]] = {}
+
+        # Expiry of each user's access token as a POSIX timestamp, so the per-turn
+        # refresh check is a float comparison (inf if the token can't be refreshed)
+        self._gdrive_expiry: dict[str, float] = {}
+
+        # Users with cached credentials, least recently used first, with the
+        # monotonic time of their last access
+        self._gdrive_recent: OrderedDict[str, float] = OrderedDict()
+
+        # Monotonic time each user's cached credentials were last checked against storage
+        self._gdrive_checked: dict[str, float] = {}
+
+        # Users with a background token refresh in flight, and the lock guarding
+        # it together with the per-user caches and persisting a user's credentials
+        self._refreshing: set[str] = set()
+        self._refresh_lock = threading.Lock()
+
     def is_configured(self, user_id: str) -> bool:
         """Check if Google Drive is configured for user.
 
@@ -86,6 +192,10 @@ class GoogleDriveConfig(BaseToolkitConfig):
         Returns:
             True if user has valid Google Drive credentials
         """
+        # Credentials already loaded from storage are cached in memory
+        if self._cached_credentials(user_id) is not None:
+            return True
+
         # Check database storage first (preferred)
         if self.token_storage:
             creds = self.token_storage.get_gdrive_credentials(user_id)
@@ -98,7 +208,7 @@ class GoogleDriveConfig(BaseToolkitConfig):
 
         return False
 
-    def extract_and_store_config(self, message: str, user_id: str) -> str | None:
+    def extract_and_store_config(self, message: str, user_id: str, message_lower: str | None = None) -> str | None:
         """Extract and store Google Drive authorization code from message.
 
         Supports patterns like:
@@ -109,6 +219,7 @@ class GoogleDriveConfig(BaseToolkitConfig):
         Args:
             message: User message that may contain auth code
             user_id: User identifier
+            message_lower: Lowercased message shared by the caller (see _message_lower)
 
         Returns:
             Confirmation message if code was extracted and stored,
@@ -118,7 +229,7 @@ class GoogleDriveConfig(BaseToolkitConfig):
             ValueError: If authorization code is invalid
         """
         # Try to extract Google Drive auth code
-        auth_code = self._extract_gdrive_code(message)
+        auth_code = self._extract_gdrive_code(message, message_lower)
 
         if not auth_code:
             return None
@@ -130,26 +241,28 @@ class GoogleDriveConfig(BaseToolkitConfig):
             creds = self._exchange_gdrive_code(auth_code, user_id)
 
             # Validate by making test API call
-            service = build("drive", "v3", credentials=creds)
+            service = self._build_drive_service(creds)
             user_info = service.about().get(fields="user").execute()
 
             logger.info(f"Google Drive token validated successfully for user {user_id}")
 
-            # Store the credentials in database if available, otherwise in memory
-            if self.token_storage:
-                self.token_storage.upsert_gdrive_token(user_id, creds)
-                logger.info(f"Stored Google Drive credentials in database for user {user_id}")
-            else:
-                # Fall back to in-memory storage (legacy)
-                if user_id not in self._user_configs:
-                    self._user_configs[user_id] = {}
-                self._user_configs[user_id]["gdrive_token"] = creds.to_json()
-                logger.info(f"Stored Google Drive credentials in memory for user {user_id}")
-
-            # Create GoogleDriveTools toolkit for this user with credentials
-            toolkit = GoogleDriveTools(credentials=creds)
-            self._gdrive_toolkits[user_id] = toolkit
-            logger.info(f"Created Google Drive toolkit for user {user_id}")
+            # Store the credentials and replace any cached ones under the refresh
+            # lock, so a background refresh of the old credentials can't overwrite them
+            with self._refresh_lock:
+                if self.token_storage:
+                    self.token_storage.upsert_gdrive_token(user_id, creds)
+                else:
+                    # Fall back to in-memory storage (legacy)
+                    self._user_configs.setdefault(user_id, {})["gdrive_token"] = creds.to_json()
+                self._gdrive_creds[user_id] = (creds, not self.token_storage)
+                self._gdrive_expiry[user_id] = self._expiry_timestamp(creds)
+                self._gdrive_checked[user_id] = time.monotonic()
+                self._gdrive_toolkits.pop(user_id, None)
+            logger.info(f"Stored Google Drive credentials in {'database' if self.token_storage else 'memory'} for user {user_id}")
+
+            # Replace the dropped toolkit with one for the new credentials, reusing the validated service
+            self._ensure_toolkit(user_id, creds, service)
+            self._touch_user(user_id)
 
             # Return validation message
             user_name = user_info.get("user", {}).get("displayName", "Unknown")
@@ -180,26 +293,16 @@ class GoogleDriveConfig(BaseToolkitConfig):
         # Generate OAuth URL and return prompt
         try:
             oauth_url = self._generate_gdrive_oauth_url(user_id)
-            prompt = (
-                "🔐 **Google Drive Authorization Required**\n\n"
-                "To use this agent, you need to authorize Google Drive access:\n\n"
-                f"1. **Visit this URL**: {oauth_url}\n"
-                "2. Sign in and authorize the application\n"
-                "3. After authorizing, you'll be redirected to a page that won't load\n"
-                "4. **Copy the entire URL** from your browser's address bar\n"
-                "   It will look like: `http://localhost?code=4/0AeaYSHB...`\n"
-                "5. **Paste the URL here** (or just the code starting with '4/')\n\n"
-                "Once authorized, you'll be able to use the agent."
+            return _OAUTH_PROMPT.format(
+                intro="To use this agent, you need to authorize Google Drive access",
+                oauth_url=oauth_url,
+                outro="Once authorized, you'll be able to use the agent.",
             )
-            return prompt
         except ValueError as e:
             # OAuth not configured
-            error_msg = (
-                f"❌ {str(e)}\n\nGoogle Drive integration requires OAuth credentials to be configured. Please contact your administrator."
-            )
-            return error_msg
+            return _OAUTH_NOT_CONFIGURED_PROMPT.format(error=e)
 
-    def get_toolkit(self, user_id: str) -> GoogleDriveTools | None:
+    def get_toolkit(self, user_id: str) -> "GoogleDriveTools | None":
         """Get Google Drive toolkit for user if configured.
 
         Args:
@@ -213,30 +316,19 @@ class GoogleDriveConfig(BaseToolkitConfig):
 
         return self._gdrive_toolkits.get(user_id)
 
-    def check_authorization_request(self, message: str, user_id: str) -> str | None:
+    def check_authorization_request(self, message: str, user_id: str, message_lower: str | None = None) -> str | None:
         """Check if message requests Google Drive access and handle authorization.
 
         Args:
             message: User message
             user_id: User identifier
+            message_lower: Lowercased message shared by the caller (see _message_lower)
 
         Returns:
             OAuth URL prompt if user needs to authorize, None otherwise
         """
         # Check if message mentions Google Drive
-        gdrive_keywords = [
-            "google drive",
-            "gdrive",
-            "google doc",
-            "google sheet",
-            "google slides",
-            "drive.google.com",
-        ]
-
-        message_lower = message.lower()
-        mentions_gdrive = any(keyword in message_lower for keyword in gdrive_keywords)
-
-        if not mentions_gdrive:
+        if not _GDRIVE_KEYWORDS_RE.search(message):
             return None
 
         # Check if user already has Google Drive credentials
@@ -248,25 +340,15 @@ class GoogleDriveConfig(BaseToolkitConfig):
         # User needs to authorize - generate OAuth URL
         try:
             oauth_url = self._generate_gdrive_oauth_url(user_id)
-            prompt = (
-                "🔐 **Google Drive Authorization Required**\n\n"
-                "To access Google Drive documents, please authorize:\n\n"
-                f"1. **Visit this URL**: {oauth_url}\n"
-                "2. Sign in and authorize the application\n"
-                "3. After authorizing, you'll be redirected to a page that won't load\n"
-                "4. **Copy the entire URL** from your browser's address bar\n"
-                "   It will look like: `http://localhost?code=4/0AeaYSHB...`\n"
-                "5. **Paste the URL here** (or just the code starting with '4/')\n\n"
-                "Once authorized, I'll be able to access your Google Drive documents."
+            return _OAUTH_PROMPT.format(
+                intro="To access Google Drive documents, please authorize",
+                oauth_url=oauth_url,
+                outro="Once authorized, I'll be able to access your Google Drive documents.",
             )
-            return prompt
 
         except ValueError as e:
             # OAuth not configured
-            error_msg = (
-                f"❌ {str(e)}\n\nGoogle Drive integration requires OAuth credentials to be configured. Please contact your administrator."
-            )
-            return error_msg
+            return _OAUTH_NOT_CONFIGURED_PROMPT.format(error=e)
 
     def requires_agent_recreation(self, config_name: str) -> bool:
         """Check if this config requires agent recreation.
@@ -300,7 +382,7 @@ class GoogleDriveConfig(BaseToolkitConfig):
 
     # Private helper methods
 
-    def _extract_gdrive_code(self, message: str) -> str | None:
+    def _extract_gdrive_code(self, message: str, message_lower: str | None = None) -> str | None:
         """Extract Google Drive auth code from user message.
 
         Supports:
@@ -311,40 +393,35 @@ class GoogleDriveConfig(BaseToolkitConfig):
 
         Args:
             message: User message text
+            message_lower: Lowercased message, if already computed (see _message_lower)
 
         Returns:
             Extracted auth code or None if not found
         """
+        # Every supported format contains either "4/" or the word "code", so
+        # only run the regex passes whose literal text is present in the message
+        has_code_prefix = "4/" in message
+        message_lower = self._message_lower(message, message_lower)
+        has_code_word = "code" in message_lower
+        if not has_code_prefix and not has_code_word:
+            return None
+
         # First, try to extract from URL (most common - user pastes redirect URL)
-        # Match: http://localhost?code=4/... or http://localhost/?code=4/...
-        url_pattern = r"(?:https?://[^\s]*[?&])?code=([^&\s]+)"
-        match = re.search(url_pattern, message, re.IGNORECASE)
+        match = _URL_CODE_RE.search(message) if "code=" in message_lower else None
         if match:
             code = match.group(1)
             # Verify it looks like a Google OAuth code (starts with 4/)
             if code.startswith("4/"):
                 return code
 
-        # Create flexible regex patterns for natural language
-        patterns = [
-            # "my google drive code is 4/..."
-            r"(?:my\s+)?(?:google\s+drive|gdrive|drive)\s+"
-            r"(?:auth\s+)?code\s+(?:is|=|:)\s+([^\s]+)",
-            # "set google drive code to 4/..."
-            r"set\s+(?:google\s+drive|gdrive|drive)\s+code\s+to\s+([^\s]+)",
-        ]
-
-        for pattern in patterns:
-            match = re.search(pattern, message, re.IGNORECASE)
-            if match:
-                return match.group(1)
+        if has_code_word:
+            for pattern in _NL_CODE_RES:
+                match = pattern.search(message)
+                if match:
+                    return match.group(1)
 
         # Try to detect standalone Google OAuth authorization codes
-        # Google OAuth codes typically:
-        # - Start with "4/"
-        # - Are followed by many alphanumeric characters, underscores, hyphens
-        oauth_code_pattern = r"(?:^|\s)(4/[A-Za-z0-9_\-\.]+)(?:\s|$)"
-        match = re.search(oauth_code_pattern, message)
+        match = _STANDALONE_CODE_RE.search(message) if has_code_prefix else None
         if match:
             return match.group(1)
 
@@ -362,24 +439,15 @@ class GoogleDriveConfig(BaseToolkitConfig):
         Raises:
             ValueError: If OAuth client credentials are not configured
         """
-        if not self._gdrive_client_id or not self._gdrive_client_secret:
+        if self._gdrive_client_config is None:
             raise ValueError(
                 "Google Drive OAuth is not configured. Please set GDRIVE_CLIENT_ID and GDRIVE_CLIENT_SECRET environment variables."
             )
 
+        from google_auth_oauthlib.flow import Flow
+
         # Create OAuth flow
-        flow = Flow.from_client_config(
-            {
-                "installed": {
-                    "client_id": self._gdrive_client_id,
-                    "client_secret": self._gdrive_client_secret,
-                    "auth_uri": "https://accounts.google.com/o/oauth2/auth",
-                    "token_uri": "https://oauth2.googleapis.com/token",
-                    "redirect_uris": [self._gdrive_redirect_uri],
-                }
-            },
-            scopes=self._gdrive_scopes,
-        )
+        flow = Flow.from_client_config(self._gdrive_client_config, scopes=self._gdrive_scopes)
         flow.redirect_uri = self._gdrive_redirect_uri
 
         # Generate authorization URL with state parameter
@@ -392,7 +460,7 @@ class GoogleDriveConfig(BaseToolkitConfig):
 
         return auth_url
 
-    def _exchange_gdrive_code(self, code: str, user_id: str) -> Credentials:
+    def _exchange_gdrive_code(self, code: str, user_id: str) -> "Credentials":
         """Exchange OAuth authorization code for access tokens.
 
         Args:
@@ -405,25 +473,16 @@ class GoogleDriveConfig(BaseToolkitConfig):
         Raises:
             ValueError: If OAuth client credentials are not configured or code is invalid
         """
-        if not self._gdrive_client_id or not self._gdrive_client_secret:
+        if self._gdrive_client_config is None:
             raise ValueError(
                 "Google Drive OAuth is not configured. Please set GDRIVE_CLIENT_ID and GDRIVE_CLIENT_SECRET environment variables."
             )
 
+        from google_auth_oauthlib.flow import Flow
+
         try:
             # Create OAuth flow
-            flow = Flow.from_client_config(
-                {
-                    "installed": {
-                        "client_id": self._gdrive_client_id,
-                        "client_secret": self._gdrive_client_secret,
-                        "auth_uri": "https://accounts.google.com/o/oauth2/auth",
-                        "token_uri": "https://oauth2.googleapis.com/token",
-                        "redirect_uris": [self._gdrive_redirect_uri],
-                    }
-                },
-                scopes=self._gdrive_scopes,
-            )
+            flow = Flow.from_client_config(self._gdrive_client_config, scopes=self._gdrive_scopes)
             flow.redirect_uri = self._gdrive_redirect_uri
 
             # Exchange code for tokens
@@ -435,10 +494,13 @@ class GoogleDriveConfig(BaseToolkitConfig):
             logger.error(f"Failed to exchange Google Drive authorization code for user {user_id}: {e}")
             raise ValueError(f"Invalid authorization code: {str(e)}") from e
 
-    def _get_gdrive_credentials(self, user_id: str) -> Credentials | None:
+    def _get_gdrive_credentials(self, user_id: str) -> "Credentials | None":
         """Get stored Google Drive credentials for a user.
 
-        Also ensures the toolkit is created for the user if it doesn't exist.
+        Credentials are loaded from storage once and then served from the
+        in-memory cache (see _cached_credentials), so the token is only
+        re-serialized when a refresh actually changes it. Also ensures the toolkit is created for the user
+        if it doesn't exist.
 
         Args:
             user_id: User identifier
@@ -446,57 +508,269 @@ class GoogleDriveConfig(BaseToolkitConfig):
         Returns:
             Google OAuth2 credentials if stored, None otherwise
         """
-        creds = None
+        cached = self._cached_credentials(user_id)
+        if cached is None:
+            loaded = self._load_gdrive_credentials(user_id)
+            if loaded is None:
+                return None
+            with self._refresh_lock:
+                # Keep credentials another thread cached while storage was being read
+                cached = self._gdrive_creds.setdefault(user_id, loaded)
+                if cached is loaded:
+                    self._gdrive_expiry[user_id] = self._expiry_timestamp(loaded[0])
+                    self._gdrive_checked[user_id] = time.monotonic()
+
+        creds, in_memory = cached
+
+        # Refresh inline if expired (e.g. clock skew or a missed refresh-ahead),
+        # otherwise refresh in the background when close to expiry
+        remaining = self._gdrive_expiry.get(user_id, math.inf) - time.time()
+        if remaining <= _EXPIRY_SKEW_SECS:
+            try:
+                from google.auth.transport.requests import Request
+
+                creds.refresh(Request())
+                # Update stored credentials with new token
+                if self._store_refreshed_credentials(user_id, creds, in_memory):
+                    logger.info(f"Refreshed Google Drive token for user {user_id}")
+            except Exception as e:
+                logger.error(f"Failed to refresh Google Drive token for user {user_id}: {e}")
+        elif remaining < _REFRESH_AHEAD_SECS:
+            self._schedule_refresh(user_id, creds, in_memory)
+
+        self._ensure_toolkit(user_id, creds)
+        self._touch_user(user_id)
+
+        return creds
+
+    def _cached_credentials(self, user_id: str) -> "tuple[Credentials, bool] | None":
+        """Get a user's cached credentials, checking storage every _STORAGE_RECHECK_SECS.
+
+        Cached credentials are dropped, along with the user's toolkit, once the
+        stored token has been deleted or replaced with one for a different
+        refresh token.
+
+        Args:
+            user_id: User identifier
+
+        Returns:
+            Tuple of (credentials, in_memory), or None if nothing usable is cached
+        """
+        cached = self._gdrive_creds.get(user_id)
+        if cached is None or time.monotonic() - self._gdrive_checked.get(user_id, -math.inf) < _STORAGE_RECHECK_SECS:
+            return cached
+
+        stored = self._load_gdrive_credentials(user_id)
+        with self._refresh_lock:
+            if self._gdrive_creds.get(user_id) is not cached:
+                # Re-authorized while storage was being read
+                return self._gdrive_creds.get(user_id)
+            if stored is None or stored[0].refresh_token != cached[0].refresh_token:
+                self._forget_user(user_id)
+                logger.info(f"Dropped cached Google Drive credentials for user {user_id}: stored token was removed or replaced")
+                return None
+            self._gdrive_checked[user_id] = time.monotonic()
+        return cached
+
+    def _load_gdrive_credentials(self, user_id: str) -> "tuple[Credentials, bool] | None":
+        """Load Google Drive credentials for a user from storage.
 
+        Args:
+            user_id: User identifier
+
+        Returns:
+            Tuple of (credentials, in_memory) where in_memory is True if they
+            came from legacy in-memory storage, or None if not stored
+        """
         # Try to get from database first (preferred)
         if self.token_storage:
             creds = self.token_storage.get_gdrive_credentials(user_id)
             if creds:
                 logger.debug(f"Retrieved Google Drive credentials from database for user {user_id}")
+                return creds, False
+
+        # Fall back to legacy in-memory storage
+        token_json = self._user_configs.get(user_id, {}).get("gdrive_token")
+        if token_json:
+            try:
+                from google.oauth2.credentials import Credentials
+
+                # Parse credentials from JSON
+                token_data = _json_loads(token_json)
+                creds = Credentials.from_authorized_user_info(token_data, self._gdrive_scopes)
+                logger.debug(f"Loaded Google Drive credentials from memory for user {user_id}")
+                return creds, True
+            except Exception as e:
+                logger.error(f"Failed to load Google Drive credentials for user {user_id}: {e}")
 
-                # Refresh if expired
-                if creds.expired and creds.refresh_token:
-                    try:
-                        creds.refresh(Request())
-                        # Update stored credentials with new token
-                        self.token_storage.upsert_gdrive_token(user_id, creds)
-                        logger.info(f"Refreshed Google Drive token for user {user_id}")
-                    except Exception as e:
-                        logger.error(f"Failed to refresh Google Drive token for user {user_id}: {e}")
+        return None
 
-                # Ensure toolkit exists for this user
-                if user_id not in self._gdrive_toolkits:
-                    toolkit = GoogleDriveTools(credentials=creds)
-                    self._gdrive_toolkits[user_id] = toolkit
-                    logger.info(f"Recreated Google Drive toolkit for user {user_id}")
+    def _ensure_toolkit(self, user_id: str, creds: "Credentials", service: Any | None = None) -> "GoogleDriveTools":
+        """Get the user's GoogleDriveTools toolkit, creating it if it doesn't exist.
 
-                return creds
+        Args:
+            user_id: User identifier
+            creds: User's credentials
+            service: Optional pre-built Drive v3 service for the credentials
 
-        # Fall back to legacy in-memory storage
-        if user_id in self._user_configs:
-            token_json = self._user_configs[user_id].get("gdrive_token")
-            if token_json:
-                try:
-                    # Parse credentials from JSON
-                    token_data = json.loads(token_json)
-                    creds = Credentials.from_authorized_user_info(token_data, self._gdrive_scopes)
-
-                    # Refresh if expired
-                    if creds.expired and creds.refresh_token:
-                        creds.refresh(Request())
-                        # Update stored credentials with new token
-                        self._user_configs[user_id]["gdrive_token"] = creds.to_json()
-                        logger.info(f"Refreshed Google Drive token (in-memory) for user {user_id}")
-
-                    # Ensure toolkit exists for this user
-                    if user_id not in self._gdrive_toolkits:
-                        toolkit = GoogleDriveTools(credentials=creds)
-                        self._gdrive_toolkits[user_id] = toolkit
-                        logger.info(f"Recreated Google Drive toolkit (legacy) for user {user_id}")
-
-                    return creds
-
-                except Exception as e:
-                    logger.error(f"Failed to load Google Drive credentials for user {user_id}: {e}")
+        Returns:
+            GoogleDriveTools instance for the user
+        """
+        toolkit = self._gdrive_toolkits.get(user_id)
+        if toolkit is None:
+            from agentllm.tools.gdrive_toolkit import GoogleDriveTools
 
-        return None
+            toolkit = GoogleDriveTools(credentials=creds, service=service)
+            with self._refresh_lock:
+                toolkit = self._gdrive_toolkits.setdefault(user_id, toolkit)
+            logger.info(f"Created Google Drive toolkit for user {user_id}")
+        return toolkit
+
+    def _touch_user(self, user_id: str) -> None:
+        """Mark a user's cached credentials as recently used and evict stale users.
+
+        Users beyond _MAX_CACHED_USERS or idle for longer than _CACHE_IDLE_SECS
+        are dropped from the in-memory caches, least recently used first. Stored
+        credentials (database or legacy in-memory storage) are kept. Users with
+        a background refresh in flight are kept until the refreshed token has
+        been stored, as it is discarded once their credentials are no longer cached.
+
+        Args:
+            user_id: User identifier
+        """
+        now = time.monotonic()
+        recent = self._gdrive_recent
+        with self._refresh_lock:
+            recent[user_id] = now
+            recent.move_to_end(user_id)
+
+            # Users skipped for a refresh in flight are moved to the back, so
+            # stop once only skipped users are left
+            deferred = 0
+            while len(recent) > deferred:
+                oldest, last_used = next(iter(recent.items()))
+                if len(recent) <= _MAX_CACHED_USERS and now - last_used <= _CACHE_IDLE_SECS:
+                    break
+                if oldest in self._refreshing:
+                    recent.move_to_end(oldest)
+                    deferred += 1
+                    continue
+                self._forget_user(oldest)
+                logger.debug(f"Evicted cached Google Drive credentials for user {oldest}")
+
+    def _forget_user(self, user_id: str) -> None:
+        """Drop a user from the in-memory caches, keeping their stored credentials.
+
+        The caller must hold _refresh_lock.
+
+        Args:
+            user_id: User identifier
+        """
+        self._gdrive_recent.pop(user_id, None)
+        self._gdrive_creds.pop(user_id, None)
+        self._gdrive_expiry.pop(user_id, None)
+        self._gdrive_checked.pop(user_id, None)
+        self._gdrive_toolkits.pop(user_id, None)
+
+    @staticmethod
+    def _build_drive_service(creds: "Credentials") -> Any:
+        """Build a Drive v3 service for credentials.
+
+        Args:
+            creds: Google OAuth2 credentials
+
+        Returns:
+            Drive v3 service bound to the credentials
+        """
+        from googleapiclient.discovery import build
+
+        # Use the bundled discovery document instead of fetching it over HTTP
+        return build("drive", "v3", credentials=creds, cache_discovery=False, static_discovery=True)
+
+    @staticmethod
+    def _expiry_timestamp(creds: "Credentials") -> float:
+        """Get the expiry of refreshable credentials as a POSIX timestamp.
+
+        Args:
+            creds: Google OAuth2 credentials
+
+        Returns:
+            Expiry timestamp, or inf if the credentials have no expiry or can't be refreshed
+        """
+        if not creds.refresh_token or creds.expiry is None:
+            return math.inf
+        # google-auth stores expiry as a naive UTC datetime
+        return creds.expiry.replace(tzinfo=UTC).timestamp()
+
+    def _schedule_refresh(self, user_id: str, creds: "Credentials", in_memory: bool = False) -> None:
+        """Refresh credentials on a background thread.
+
+        At most one refresh per user is in flight at a time.
+
+        Args:
+            user_id: User identifier
+            creds: Credentials to refresh in place
+            in_memory: True if the credentials come from legacy in-memory storage
+        """
+        with self._refresh_lock:
+            if user_id in self._refreshing:
+                return
+            self._refreshing.add(user_id)
+
+        thread = threading.Thread(
+            target=self._refresh_credentials,
+            args=(user_id, creds, in_memory),
+            name=f"gdrive-refresh-{user_id}",
+            daemon=True,
+        )
+        thread.start()
+
+    def _refresh_credentials(self, user_id: str, creds: "Credentials", in_memory: bool) -> None:
+        """Refresh credentials and store the new token (background thread target).
+
+        Args:
+            user_id: User identifier
+            creds: Credentials to refresh in place
+            in_memory: True if the credentials come from legacy in-memory storage
+        """
+        try:
+            from google.auth.transport.requests import Request
+
+            creds.refresh(Request())
+            if self._store_refreshed_credentials(user_id, creds, in_memory):
+                logger.info(f"Refreshed Google Drive token ahead of expiry for user {user_id}")
+        except Exception as e:
+            logger.error(f"Failed to refresh Google Drive token for user {user_id}: {e}")
+        finally:
+            with self._refresh_lock:
+                self._refreshing.discard(user_id)
+
+    def _store_refreshed_credentials(self, user_id: str, creds: "Credentials", in_memory: bool = False) -> bool:
+        """Record the new expiry of refreshed credentials and persist them.
+
+        Credentials are written to wherever the user's token is stored. If the
+        user re-authorized, or the stored token was removed, while the refresh
+        was in flight, the refreshed credentials are stale and are discarded
+        rather than overwriting the new ones. Cache eviction keeps users with a
+        background refresh in flight (see _touch_user).
+
+        Args:
+            user_id: User identifier
+            creds: Refreshed credentials
+            in_memory: True to update legacy in-memory storage instead of the database
+
+        Returns:
+            True if the credentials were stored, False if they were discarded
+        """
+        with self._refresh_lock:
+            cached = self._gdrive_creds.get(user_id)
+            if cached is None or cached[0] is not creds:
+                logger.info(f"Discarding refreshed Google Drive token for user {user_id}: credentials were replaced or removed")
+                return False
+
+            self._gdrive_expiry[user_id] = self._expiry_timestamp(creds)
+            if in_memory:
+                self._user_configs.setdefault(user_id, {})["gdrive_token"] = creds.to_json()
+            else:
+                self.token_storage.upsert_gdrive_token(user_id, creds)
+        return True
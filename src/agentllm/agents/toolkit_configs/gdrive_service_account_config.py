@@ -87,7 +87,7 @@ class GDriveServiceAccountConfig(BaseToolkitConfig):
         """
         return self._credentials is not None
 
-    def extract_and_store_config(self, message: str, user_id: str) -> str | None:
+    def extract_and_store_config(self, message: str, user_id: str, message_lower: str | None = None) -> str | None:
         """Service accounts don't extract config from messages.
 
         Service accounts are configured via environment variables, not user messages.
@@ -95,6 +95,7 @@ class GDriveServiceAccountConfig(BaseToolkitConfig):
         Args:
             message: User message (ignored)
             user_id: User identifier (ignored)
+            message_lower: Lowercased message shared by the caller (see _message_lower)
 
         Returns:
             None (no config extraction)
@@ -140,7 +141,7 @@ class GDriveServiceAccountConfig(BaseToolkitConfig):
         # Return shared toolkit instance
         return self._toolkit
 
-    def check_authorization_request(self, message: str, user_id: str) -> str | None:
+    def check_authorization_request(self, message: str, user_id: str, message_lower: str | None = None) -> str | None:
         """Check if message requests Google Drive access.
 
         Service accounts don't require per-user authorization, so this only
@@ -149,6 +150,7 @@ class GDriveServiceAccountConfig(BaseToolkitConfig):
         Args:
             message: User message
             user_id: User identifier
+            message_lower: Lowercased message shared by the caller (see _message_lower)
 
         Returns:
             Configuration prompt if service account not set up, None otherwise
@@ -163,7 +165,7 @@ class GDriveServiceAccountConfig(BaseToolkitConfig):
             "drive.google.com",
         ]
 
-        message_lower = message.lower()
+        message_lower = self._message_lower(message, message_lower)
         mentions_gdrive = any(keyword in message_lower for keyword in gdrive_keywords)
 
         if not mentions_gdrive:
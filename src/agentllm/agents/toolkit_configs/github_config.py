@@ -6,6 +6,41 @@ from loguru import logger
 
 from .base import BaseToolkitConfig
 
+# GitHubToolkit class, imported lazily on first use (see _get_toolkit_cls)
+_GitHubToolkit = None
+
+# Keywords indicating the user is asking about GitHub. "pr" and "repo" only
+# match as whole words so that e.g. "spring" or "report" don't count.
+_GITHUB_KEYWORDS_RE = re.compile(
+    r"github|pull request|\bprs?\b|review|\brepos?\b|repositor(?:y|ies)",
+    re.IGNORECASE,
+)
+
+# Standalone classic tokens: ghp_ (personal), gho_ (OAuth), ghu_ (user-to-server),
+# ghs_ (server-to-server), ghr_ (refresh token)
+# Format: prefix + 36 alphanumeric characters
+_CLASSIC_TOKEN_PREFIXES = ("ghp_", "gho_", "ghu_", "ghs_", "ghr_")
+_CLASSIC_TOKEN_MIN_LEN = 4 + 36
+
+# Standalone fine-grained tokens: github_pat_
+# Format: github_pat_ + base62 string (typically 22 chars) + _ + base62 string (typically 59 chars)
+# Total length varies but typically ~93 characters after the prefix
+_FINE_GRAINED_TOKEN_PREFIX = "github_pat_"
+_FINE_GRAINED_TOKEN_MIN_LEN = len(_FINE_GRAINED_TOKEN_PREFIX) + 80
+
+
+def _get_toolkit_cls():
+    """Import GitHubToolkit once per process and return the class.
+
+    The import is deferred to avoid a circular dependency with agentllm.tools.
+    """
+    global _GitHubToolkit
+    if _GitHubToolkit is None:
+        from agentllm.tools.github_toolkit import GitHubToolkit
+
+        _GitHubToolkit = GitHubToolkit
+    return _GitHubToolkit
+
 
 class GitHubConfig(BaseToolkitConfig):
     """GitHub configuration manager.
@@ -33,6 +68,9 @@ class GitHubConfig(BaseToolkitConfig):
         # Store per-user GitHub toolkits (in-memory cache)
         self._github_toolkits: dict[str, object] = {}
 
+        # Per-user GitHub tokens when there is no token storage (legacy)
+        self._github_tokens: dict[str, str] = {}
+
     def is_required(self) -> bool:
         """GitHub is an optional toolkit.
 
@@ -52,26 +90,11 @@ class GitHubConfig(BaseToolkitConfig):
         Returns:
             True if user has a valid GitHub token
         """
-        logger.info(f"🔍 GitHubConfig.is_configured() called for user_id={user_id}")
-
-        # Check database storage first (preferred)
-        if self.token_storage:
-            token_data = self.token_storage.get_github_token(user_id)
-            if token_data:
-                logger.info(f"✅ Found GitHub token in database for user {user_id}")
-                return True
-            else:
-                logger.info(f"❌ No GitHub token in database for user {user_id}")
-
-        # Fall back to legacy in-memory storage
-        if user_id in self._user_configs and "github_token" in self._user_configs[user_id]:
-            logger.info(f"✅ Found GitHub token in memory for user {user_id}")
+        if user_id in self._github_tokens:
             return True
+        return self._load_token_record(user_id) is not None
 
-        logger.info(f"❌ GitHub NOT configured for user {user_id}")
-        return False
-
-    def extract_and_store_config(self, message: str, user_id: str) -> str | None:
+    def extract_and_store_config(self, message: str, user_id: str, message_lower: str | None = None) -> str | None:
         """Extract and store GitHub token from user message.
 
         Supports patterns like:
@@ -85,6 +108,7 @@ class GitHubConfig(BaseToolkitConfig):
         Args:
             message: User message that may contain GitHub token
             user_id: User identifier
+            message_lower: Lowercased message shared by the caller (see _message_lower)
 
         Returns:
             Confirmation message if token was extracted and stored,
@@ -94,7 +118,7 @@ class GitHubConfig(BaseToolkitConfig):
             ValueError: If GitHub token is invalid
         """
         # Try to extract GitHub token
-        token = self._extract_github_token(message)
+        token = self._extract_github_token(message, message_lower)
 
         if not token:
             return None
@@ -102,17 +126,9 @@ class GitHubConfig(BaseToolkitConfig):
         logger.info(f"Validating GitHub token for user {user_id}")
 
         try:
-            # Import here to avoid circular dependency
-            from agentllm.tools.github_toolkit import GitHubToolkit
-
-            # Create toolkit with the token
-            toolkit = GitHubToolkit(
-                token=token,
-                server_url=self._server_url,
-            )
-
-            # Validate the connection
-            success, validation_message = toolkit.validate_connection()
+            # Validate the token before building a toolkit for it
+            toolkit_cls = _get_toolkit_cls()
+            success, validation_message = toolkit_cls.validate_token(token, self._server_url)
 
             if not success:
                 logger.error(f"GitHub token validation failed for user {user_id}: {validation_message}")
@@ -120,6 +136,11 @@ class GitHubConfig(BaseToolkitConfig):
 
             logger.info(f"GitHub token validated successfully for user {user_id}")
 
+            toolkit = toolkit_cls(
+                token=token,
+                server_url=self._server_url,
+            )
+
             # Store the token in database if available, otherwise in memory
             if self.token_storage:
                 success = self.token_storage.upsert_github_token(
@@ -129,19 +150,11 @@ class GitHubConfig(BaseToolkitConfig):
                 )
                 if success:
                     logger.info(f"✅ Stored GitHub token in database for user {user_id}")
-                    # Verify it was stored
-                    verify = self.token_storage.get_github_token(user_id)
-                    if verify:
-                        logger.info(f"✅ Verified token retrieval for user {user_id}")
-                    else:
-                        logger.error(f"❌ Failed to verify token for user {user_id}")
                 else:
                     logger.error(f"❌ Failed to store GitHub token for user {user_id}")
             else:
                 # Fall back to in-memory storage (legacy)
-                if user_id not in self._user_configs:
-                    self._user_configs[user_id] = {}
-                self._user_configs[user_id]["github_token"] = token
+                self._github_tokens[user_id] = token
                 logger.info(f"Stored GitHub token in memory for user {user_id}")
 
             # Store the toolkit for this user (in-memory cache)
@@ -204,80 +217,44 @@ class GitHubConfig(BaseToolkitConfig):
             return self._github_toolkits[user_id]
 
         # If we have token but no toolkit (e.g., after restart), recreate it
-        if not self.is_configured(user_id):
+        token_data = self._load_token_record(user_id)
+        if token_data is None:
             return None
 
-        # Recreate toolkit from database or memory
-        toolkit = None
-        if self.token_storage:
-            # Get credentials from database
-            try:
-                from agentllm.tools.github_toolkit import GitHubToolkit
-
-                token_data = self.token_storage.get_github_token(user_id)
-                if not token_data:
-                    logger.error(f"No GitHub token found in database for user {user_id}")
-                    return None
-
-                toolkit = GitHubToolkit(
-                    token=token_data["token"],
-                    server_url=token_data["server_url"],
-                )
-                logger.info(f"Recreated GitHub toolkit from database for user {user_id}")
-            except Exception as e:
-                logger.error(f"Failed to create GitHub toolkit from database: {e}")
-                return None
-        else:
-            # Use legacy in-memory authentication
-            if user_id in self._user_configs and "github_token" in self._user_configs[user_id]:
-                from agentllm.tools.github_toolkit import GitHubToolkit
-
-                token = self._user_configs[user_id]["github_token"]
-                toolkit = GitHubToolkit(
-                    token=token,
-                    server_url=self._server_url,
-                )
-                logger.info(f"Recreated GitHub toolkit (legacy) for user {user_id}")
+        try:
+            toolkit = _get_toolkit_cls()(
+                token=token_data["token"],
+                server_url=token_data["server_url"],
+            )
+            logger.info(f"Recreated GitHub toolkit for user {user_id}")
+        except Exception as e:
+            logger.error(f"Failed to recreate GitHub toolkit for user {user_id}: {e}")
+            return None
 
-        if toolkit:
-            self._github_toolkits[user_id] = toolkit
+        self._github_toolkits[user_id] = toolkit
 
         return toolkit
 
-    def check_authorization_request(self, message: str, user_id: str) -> str | None:
+    def check_authorization_request(self, message: str, user_id: str, message_lower: str | None = None) -> str | None:
         """Check if message requests GitHub access and prompt if needed.
 
         Args:
             message: User message
             user_id: User identifier
+            message_lower: Lowercased message shared by the caller (see _message_lower)
 
         Returns:
             GitHub token prompt if user needs to configure, None otherwise
         """
-        logger.info(f"🔍 GitHubConfig.check_authorization_request() for user {user_id}")
-
         # Check if message mentions GitHub
-        github_keywords = [
-            "github",
-            "pull request",
-            "pr",
-            "review",
-            "repository",
-            "repo",
-        ]
-
-        message_lower = message.lower()
-        mentions_github = any(keyword in message_lower for keyword in github_keywords)
-
-        if not mentions_github:
-            logger.info("ℹ️ Message doesn't mention GitHub keywords - skipping")
+        if not _GITHUB_KEYWORDS_RE.search(message):
             return None
 
-        logger.info(f"🔍 Message mentions GitHub, checking if user {user_id} is configured")
+        logger.debug(f"Message mentions GitHub, checking if user {user_id} is configured")
 
         # Check if user already has GitHub configured
         if self.is_configured(user_id):
-            logger.info(f"✅ User {user_id} has GitHub access - proceeding")
+            logger.debug(f"User {user_id} has GitHub access")
             return None
 
         # User needs to configure GitHub
@@ -315,48 +292,67 @@ class GitHubConfig(BaseToolkitConfig):
 
     # Private helper methods
 
-    def _extract_github_token(self, message: str) -> str | None:
+    def _load_token_record(self, user_id: str) -> dict | None:
+        """Get a user's GitHub token record with a single storage lookup.
+
+        Args:
+            user_id: User identifier
+
+        Returns:
+            Dict with "token" and "server_url" from the database, or from legacy
+            in-memory storage, or None if the user has no token
+        """
+        # Check database storage first (preferred)
+        if self.token_storage:
+            # Token storage caches records and misses across configs
+            token_data = self.token_storage.get_github_token(user_id)
+            if token_data:
+                return token_data
+
+        # Fall back to legacy in-memory storage
+        token = self._github_tokens.get(user_id)
+        if token:
+            return {"token": token, "server_url": self._server_url}
+
+        return None
+
+    def _extract_github_token(self, message: str, message_lower: str | None = None) -> str | None:
         """Extract GitHub token from user message.
 
         Args:
             message: User message text
+            message_lower: Lowercased message, if already computed (see _message_lower)
 
         Returns:
             Extracted token or None if not found
         """
-        # Create flexible regex patterns
-        config_name = "github_token"
-        config_pattern = config_name.replace("_", "[ _-]")
-
-        patterns = [
-            # "my github token is VALUE"
-            rf"(?:my\s+)?{config_pattern}\s+(?:is|=|:)\s+([^\s]+)",
-            # "set github token to VALUE"
-            rf"set\s+{config_pattern}\s+to\s+([^\s]+)",
-            # "github token: VALUE" or "github_token: VALUE"
-            rf"{config_pattern}:\s*([^\s]+)",
-        ]
-
-        for pattern in patterns:
-            match = re.search(pattern, message, re.IGNORECASE)
-            if match:
-                return match.group(1)
-
-        # Try to detect standalone GitHub tokens
-        # Classic tokens: ghp_ (personal), gho_ (OAuth), ghu_ (user-to-server),
-        # ghs_ (server-to-server), ghr_ (refresh token)
-        # Format: prefix + 36 alphanumeric characters
-        classic_token_pattern = r"(?:^|\s)(gh[poushr]_[A-Za-z0-9]{36,})(?:\s|$)"
-        match = re.search(classic_token_pattern, message)
-        if match:
-            return match.group(1)
-
-        # Fine-grained tokens: github_pat_
-        # Format: github_pat_ + base62 string (typically 22 chars) + _ + base62 string (typically 59 chars)
-        # Total length varies but typically ~93 characters after the prefix
-        fine_grained_token_pattern = r"(?:^|\s)(github_pat_[A-Za-z0-9_]{80,})(?:\s|$)"
-        match = re.search(fine_grained_token_pattern, message)
-        if match:
-            return match.group(1)
+        # The keyword patterns all need "github token", so only run them when
+        # the message mentions GitHub
+        if "github" in self._message_lower(message, message_lower):
+            token = self._extract_keyword_value(message, "github_token")
+            if token:
+                return token
+
+        # Try to detect standalone GitHub tokens: whole words with a known
+        # prefix, classic tokens taking priority over fine-grained ones
+        has_classic = any(prefix in message for prefix in _CLASSIC_TOKEN_PREFIXES)
+        has_fine_grained = _FINE_GRAINED_TOKEN_PREFIX in message
+        if not has_classic and not has_fine_grained:
+            return None
+
+        words = message.split()
+        if has_classic:
+            for word in words:
+                if len(word) >= _CLASSIC_TOKEN_MIN_LEN and word.startswith(_CLASSIC_TOKEN_PREFIXES):
+                    body = word[4:]
+                    if body.isascii() and body.isalnum():
+                        return word
+
+        if has_fine_grained:
+            for word in words:
+                if len(word) >= _FINE_GRAINED_TOKEN_MIN_LEN and word.startswith(_FINE_GRAINED_TOKEN_PREFIX):
+                    body = word[len(_FINE_GRAINED_TOKEN_PREFIX) :].replace("_", "")
+                    if body.isascii() and (not body or body.isalnum()):
+                        return word
 
         return None
@@ -8,6 +8,15 @@ from agentllm.tools.jira_toolkit import JiraTools
 
 from .base import BaseToolkitConfig
 
+# Keywords indicating the user is asking about JIRA (also covers issues.redhat.com)
+_JIRA_KEYWORDS_RE = re.compile(r"jira|issue|ticket", re.IGNORECASE)
+
+# Standalone tokens that are likely Jira tokens:
+# - 30+ characters
+# - Contains letters and numbers (checked by the lookaheads)
+# - May contain special chars like +, /, =
+_STANDALONE_TOKEN_RE = re.compile(r"(?:^|\s)(?=\S*[A-Za-z])(?=\S*[0-9])([A-Za-z0-9+/=]{30,})(?:\s|$)")
+
 
 class JiraConfig(BaseToolkitConfig):
     """JIRA configuration manager.
@@ -35,6 +44,9 @@ class JiraConfig(BaseToolkitConfig):
         # Store per-user JIRA toolkits (in-memory cache)
         self._jira_toolkits: dict[str, JiraTools] = {}
 
+        # Per-user JIRA tokens when there is no token storage (legacy)
+        self._jira_tokens: dict[str, str] = {}
+
     def is_configured(self, user_id: str) -> bool:
         """Check if JIRA is configured for user.
 
@@ -44,19 +56,11 @@ class JiraConfig(BaseToolkitConfig):
         Returns:
             True if user has a valid JIRA token
         """
-        # Check database storage first (preferred)
-        if self.token_storage:
-            token_data = self.token_storage.get_jira_token(user_id)
-            if token_data:
-                return True
-
-        # Fall back to legacy in-memory storage
-        if user_id in self._user_configs and "jira_token" in self._user_configs[user_id]:
+        if user_id in self._jira_tokens:
             return True
+        return self._load_token_record(user_id) is not None
 
-        return False
-
-    def extract_and_store_config(self, message: str, user_id: str) -> str | None:
+    def extract_and_store_config(self, message: str, user_id: str, message_lower: str | None = None) -> str | None:
         """Extract and store JIRA token from user message.
 
         Supports patterns like:
@@ -69,6 +73,7 @@ class JiraConfig(BaseToolkitConfig):
         Args:
             message: User message that may contain JIRA token
             user_id: User identifier
+            message_lower: Lowercased message shared by the caller (see _message_lower)
 
         Returns:
             Confirmation message if token was extracted and stored,
@@ -78,7 +83,7 @@ class JiraConfig(BaseToolkitConfig):
             ValueError: If JIRA token is invalid
         """
         # Try to extract JIRA token
-        token = self._extract_jira_token(message)
+        token = self._extract_jira_token(message, message_lower)
 
         if not token:
             return None
@@ -117,9 +122,7 @@ class JiraConfig(BaseToolkitConfig):
                 logger.info(f"Stored Jira token in database for user {user_id}")
             else:
                 # Fall back to in-memory storage (legacy)
-                if user_id not in self._user_configs:
-                    self._user_configs[user_id] = {}
-                self._user_configs[user_id]["jira_token"] = token
+                self._jira_tokens[user_id] = token
                 logger.info(f"Stored Jira token in memory for user {user_id}")
 
             # Store the toolkit for this user
@@ -171,83 +174,50 @@ class JiraConfig(BaseToolkitConfig):
         if user_id in self._jira_toolkits:
             return self._jira_toolkits[user_id]
 
-        # If we have token but no toolkit (e.g., after restart), recreate it
-        if not self.is_configured(user_id):
-            return None
-
-        # Recreate toolkit from database or memory
-        toolkit = None
-        if self.token_storage:
-            # Get credentials from database
-            try:
-                token_data = self.token_storage.get_jira_token(user_id)
-                if not token_data:
-                    logger.error(f"No Jira token found in database for user {user_id}")
-                    return None
-
-                toolkit = JiraTools(
-                    token=token_data["token"],
-                    server_url=token_data["server_url"],
-                    username=token_data.get("username"),
-                    get_issue=True,
-                    search_issues=True,
-                    add_comment=False,
-                    create_issue=False,
-                    extract_sprint_info=True,
-                    get_sprint_metrics=True,
-                )
-                logger.info(f"Recreated JIRA toolkit from database for user {user_id}")
-            except Exception as e:
-                logger.error(f"Failed to create JIRA toolkit from database: {e}")
+        try:
+            # If we have token but no toolkit (e.g., after restart), recreate it
+            token_data = self._load_token_record(user_id)
+            if token_data is None:
                 return None
-        else:
-            # Use legacy in-memory authentication
-            if user_id in self._user_configs and "jira_token" in self._user_configs[user_id]:
-                token = self._user_configs[user_id]["jira_token"]
-                toolkit = JiraTools(
-                    token=token,
-                    server_url=self._jira_server,
-                    get_issue=True,
-                    search_issues=True,
-                    add_comment=False,
-                    create_issue=False,
-                    extract_sprint_info=True,
-                    get_sprint_metrics=True,
-                )
-                logger.info(f"Recreated JIRA toolkit (legacy) for user {user_id}")
 
-        if toolkit:
-            self._jira_toolkits[user_id] = toolkit
+            toolkit = JiraTools(
+                token=token_data["token"],
+                server_url=token_data["server_url"],
+                username=token_data.get("username"),
+                get_issue=True,
+                search_issues=True,
+                add_comment=False,
+                create_issue=False,
+                extract_sprint_info=True,
+                get_sprint_metrics=True,
+            )
+            logger.info(f"Recreated JIRA toolkit for user {user_id}")
+        except Exception as e:
+            logger.error(f"Failed to recreate JIRA toolkit for user {user_id}: {e}")
+            return None
+
+        self._jira_toolkits[user_id] = toolkit
 
         return toolkit
 
-    def check_authorization_request(self, message: str, user_id: str) -> str | None:
+    def check_authorization_request(self, message: str, user_id: str, message_lower: str | None = None) -> str | None:
         """Check if message requests JIRA access and prompt if needed.
 
         Args:
             message: User message
             user_id: User identifier
+            message_lower: Lowercased message shared by the caller (see _message_lower)
 
         Returns:
             JIRA token prompt if user needs to configure, None otherwise
         """
         # Check if message mentions JIRA
-        jira_keywords = [
-            "jira",
-            "issue",
-            "ticket",
-            "issues.redhat.com",
-        ]
-
-        message_lower = message.lower()
-        mentions_jira = any(keyword in message_lower for keyword in jira_keywords)
-
-        if not mentions_jira:
+        if not _JIRA_KEYWORDS_RE.search(message):
             return None
 
         # Check if user already has JIRA configured
         if self.is_configured(user_id):
-            logger.info(f"User {user_id} has JIRA access")
+            logger.debug(f"User {user_id} has JIRA access")
             return None
 
         # User needs to configure JIRA
@@ -284,46 +254,48 @@ class JiraConfig(BaseToolkitConfig):
 
     # Private helper methods
 
-    def _extract_jira_token(self, message: str) -> str | None:
+    def _load_token_record(self, user_id: str) -> dict | None:
+        """Get a user's JIRA token record with a single storage lookup.
+
+        Args:
+            user_id: User identifier
+
+        Returns:
+            Dict with "token" and "server_url" (and "username" if stored) from the
+            database, or from legacy in-memory storage, or None if the user has no token
+        """
+        # Check database storage first (preferred)
+        if self.token_storage:
+            token_data = self.token_storage.get_jira_token(user_id)
+            if token_data:
+                return token_data
+
+        # Fall back to legacy in-memory storage
+        token = self._jira_tokens.get(user_id)
+        if token:
+            return {"token": token, "server_url": self._jira_server}
+
+        return None
+
+    def _extract_jira_token(self, message: str, message_lower: str | None = None) -> str | None:
         """Extract JIRA token from user message.
 
         Args:
             message: User message text
+            message_lower: Lowercased message, if already computed (see _message_lower)
 
         Returns:
             Extracted token or None if not found
         """
-        # Create flexible regex patterns
-        config_name = "jira_token"
-        config_pattern = config_name.replace("_", "[ _-]")
-
-        patterns = [
-            # "my jira token is VALUE"
-            rf"(?:my\s+)?{config_pattern}\s+(?:is|=|:)\s+([^\s]+)",
-            # "set jira token to VALUE"
-            rf"set\s+{config_pattern}\s+to\s+([^\s]+)",
-            # "jira token: VALUE" or "jira_token: VALUE"
-            rf"{config_pattern}:\s*([^\s]+)",
-        ]
-
-        for pattern in patterns:
-            match = re.search(pattern, message, re.IGNORECASE)
-            if match:
-                return match.group(1)
+        # The keyword patterns all need "jira token"
+        if "jira" in self._message_lower(message, message_lower):
+            token = self._extract_keyword_value(message, "jira_token")
+            if token:
+                return token
 
         # Try to detect standalone long alphanumeric tokens (30+ characters)
-        # Match standalone tokens that are likely Jira tokens:
-        # - 30+ characters
-        # - Contains letters and numbers
-        # - May contain special chars like +, /, =
-        token_pattern = r"(?:^|\s)([A-Za-z0-9+/=]{30,})(?:\s|$)"
-        match = re.search(token_pattern, message)
+        match = _STANDALONE_TOKEN_RE.search(message)
         if match:
-            potential_token = match.group(1)
-            # Basic validation: should have both letters and numbers
-            has_letters = bool(re.search(r"[A-Za-z]", potential_token))
-            has_numbers = bool(re.search(r"[0-9]", potential_token))
-            if has_letters and has_numbers:
-                return potential_token
+            return match.group(1)
 
         return None
@@ -39,7 +39,7 @@ class RHAIToolkitConfig(BaseToolkitConfig):
         else:
             logger.debug("RHAI toolkit not configured (AGENTLLM_RHAI_ROADMAP_PUBLISHER_RELEASE_SHEET not set)")
 
-    def check_authorization_request(self, message: str, user_id: str) -> str | None:  # noqa: ARG002
+    def check_authorization_request(self, message: str, user_id: str, message_lower: str | None = None) -> str | None:  # noqa: ARG002
         """Check if message requests this toolkit and handle authorization.
 
         RHAI Toolkit doesn't require separate authorization.
@@ -48,13 +48,14 @@ class RHAIToolkitConfig(BaseToolkitConfig):
         Args:
             message: User message
             user_id: User identifier
+            message_lower: Lowercased message shared by the caller (see _message_lower)
 
         Returns:
             None (no authorization needed)
         """
         return None
 
-    def extract_and_store_config(self, message: str, user_id: str) -> str | None:  # noqa: ARG002
+    def extract_and_store_config(self, message: str, user_id: str, message_lower: str | None = None) -> str | None:  # noqa: ARG002
         """Try to extract configuration from user message.
 
         RHAI Toolkit has no extractable configuration from messages.
@@ -63,6 +64,7 @@ class RHAIToolkitConfig(BaseToolkitConfig):
         Args:
             message: User message
             user_id: User identifier
+            message_lower: Lowercased message shared by the caller (see _message_lower)
 
         Returns:
             None (no configuration to extract)
@@ -5,6 +5,7 @@ The toolkit does not support creating, updating, or modifying customer cases.
 """
 
 import re
+import time
 
 from loguru import logger
 
@@ -12,6 +13,83 @@ from agentllm.tools.rhcp_toolkit import RHCPTools
 
 from .base import BaseToolkitConfig
 
+# How long a user found to have an offline token is trusted before storage is
+# checked again, so a token deleted or revoked in storage is noticed
+_CONFIGURED_TTL_SECS = 300.0
+
+# Phrases indicating the user is asking about RHCP or customer cases (lowercase)
+_RHCP_KEYWORDS = (
+    "rhcp",
+    "customer portal",
+    "customer case",
+    "case number",
+    "entitlement",
+    "access.redhat.com",
+)
+
+# RHCP token patterns, tried in order:
+# - "my rhcp token is VALUE" (also "rhcp offline token")
+# - "set rhcp token to VALUE"
+# - "rhcp token: VALUE"
+# - "my offline token is VALUE"
+# They are matched against the lowercased message, which is cheaper than
+# case-insensitive matching. The IGNORECASE variants are only used when
+# lowercasing changes the message length, so offsets no longer line up.
+_TOKEN_PATTERNS = (
+    re.compile(r"(?:my\s+)?rhcp\s+(?:offline\s+)?token\s+(?:is|=|:)\s+([^\s]+)"),
+    re.compile(r"set\s+rhcp\s+(?:offline\s+)?token\s+to\s+([^\s]+)"),
+    re.compile(r"rhcp\s+(?:offline\s+)?token:\s*([^\s]+)"),
+    re.compile(r"(?:my\s+)?offline\s+token\s+(?:is|=|:)\s+([^\s]+)"),
+)
+_TOKEN_PATTERNS_ANY_CASE = tuple(re.compile(pattern.pattern, re.IGNORECASE) for pattern in _TOKEN_PATTERNS)
+
+# Standalone long tokens (100+ characters), starting with "eyJ" (base64 JWT
+# header). RHCP offline tokens are typically very long (200+ chars).
+# Format: eyJhbGciOiJIUzI1NiIsInR5cCIgOiAiSldUIiwia2lkIiA6ICJhZD...
+# The pattern is matched at each "eyJ" that starts a word, and the token must
+# end at whitespace or the end of the message.
+_STANDALONE_TOKEN_PREFIX = "eyJ"
+_STANDALONE_TOKEN_MIN_LEN = 100
+_STANDALONE_TOKEN_RE = re.compile(r"[A-Za-z0-9_\-\.]{100,}")
+
+# Prompt asking an unconfigured user for their offline token
+_CONFIG_PROMPT = (
+    "🔑 **Red Hat Customer Portal (RHCP) Configuration Required**\n\n"
+    "To access customer case information, please provide your RHCP offline token:\n\n"
+    "Say: 'My RHCP offline token is YOUR_OFFLINE_TOKEN_HERE'\n\n"
+    "To get an RHCP offline token:\n"
+    "1. Go to https://access.redhat.com/management/api\n"
+    "2. Click 'Generate Token' under 'Offline Token'\n"
+    "3. Copy the token (it will be a long string)\n"
+    "4. Send it to me in the format above\n\n"
+    "See also: https://access.redhat.com/articles/3626371"
+)
+
+# Agent instructions added once the user has an RHCP toolkit
+_RHCP_INSTRUCTIONS = (
+    "Red Hat Customer Portal (RHCP) Integration:",
+    "- CRITICAL: You NOW HAVE access to RHCP tools - any previous statements about not having RHCP access are outdated",
+    "- IMPORTANT: Your current capabilities include READ-ONLY access to customer case information",
+    "- Available tools that you MUST use when asked about customer cases:",
+    "  - get_case(case_number): Get detailed information about a specific customer case",
+    "  - search_cases(query, limit): Search for customer cases using queries",
+    "- Case data you can retrieve: severity, status, escalation status, entitlement level, SLA information",
+    "- ALWAYS use RHCP tools when asked about customer cases or case numbers - do not claim you lack access",
+    "- Track linked customer cases and provide full context from RHCP",
+    "- CRITICAL: Do NOT create, update, or modify customer cases - READ-ONLY access only",
+    "- Cross-reference JIRA issues with RHCP customer cases:",
+    "  * JIRA stores case numbers in customfield_12313441 (use cf[12313441] in JQL queries)",
+    "  * Example: Find JIRA issues for case 04312027: 'project = RHDHSUPP AND cf[12313441] = 04312027'",
+    "  * Then use get_case(case_number) to fetch RHCP case details",
+    "- Apply severity-to-priority mapping when analyzing issues:",
+    "  * Severity '1 (Urgent)' → Priority 'Critical'",
+    "  * Severity '2 (High)' → Priority 'Major'",
+    "  * Severity '3 (Normal)' → Priority 'Normal'",
+    "  * Severity '4 (Low)' → Priority 'Minor'",
+    "  * is_escalated=true → Priority 'Blocker' (overrides severity mapping)",
+    "- Include case severity and escalation status in your recommendations",
+)
+
 
 class RHCPConfig(BaseToolkitConfig):
     """Red Hat Customer Portal configuration manager.
@@ -41,6 +119,13 @@ class RHCPConfig(BaseToolkitConfig):
         # Store per-user RHCP toolkits (in-memory cache)
         self._rhcp_toolkits: dict[str, RHCPTools] = {}
 
+        # Users known to have an RHCP offline token, with the monotonic time the
+        # answer expires (see _CONFIGURED_TTL_SECS). Cleared by invalidate().
+        self._configured_users: dict[str, float] = {}
+
+        # Per-user RHCP offline tokens when there is no token storage (legacy)
+        self._rhcp_tokens: dict[str, str] = {}
+
     def is_configured(self, user_id: str) -> bool:
         """Check if RHCP is configured for user.
 
@@ -50,19 +135,17 @@ class RHCPConfig(BaseToolkitConfig):
         Returns:
             True if user has a valid RHCP offline token
         """
-        # Check database storage first (preferred)
-        if self.token_storage:
-            token_data = self.token_storage.get_rhcp_token(user_id)
-            if token_data:
-                return True
-
-        # Fall back to legacy in-memory storage
-        if user_id in self._user_configs and "rhcp_offline_token" in self._user_configs[user_id]:
+        configured_until = self._configured_users.get(user_id)
+        if configured_until is not None and time.monotonic() < configured_until:
             return True
-
+        if self._load_offline_token(user_id) is not None:
+            return True
+        # The token is gone from storage: drop anything cached for it
+        if configured_until is not None:
+            self.invalidate(user_id)
         return False
 
-    def extract_and_store_config(self, message: str, user_id: str) -> str | None:
+    def extract_and_store_config(self, message: str, user_id: str, message_lower: str | None = None) -> str | None:
         """Extract and store RHCP offline token from user message.
 
         Supports patterns like:
@@ -76,6 +159,7 @@ class RHCPConfig(BaseToolkitConfig):
         Args:
             message: User message that may contain RHCP offline token
             user_id: User identifier
+            message_lower: Lowercased message shared by the caller (see _message_lower)
 
         Returns:
             Confirmation message if token was extracted and stored,
@@ -85,7 +169,7 @@ class RHCPConfig(BaseToolkitConfig):
             ValueError: If RHCP offline token is invalid
         """
         # Try to extract RHCP offline token
-        offline_token = self._extract_rhcp_token(message)
+        offline_token = self._extract_rhcp_token(message, message_lower)
 
         if not offline_token:
             return None
@@ -109,6 +193,9 @@ class RHCPConfig(BaseToolkitConfig):
 
             logger.info(f"RHCP offline token validated successfully for user {user_id}")
 
+            # Replace whatever was cached for the user's previous token
+            self.invalidate(user_id)
+
             # Store the token in database if available, otherwise in memory
             if self.token_storage:
                 self.token_storage.upsert_rhcp_token(
@@ -118,13 +205,12 @@ class RHCPConfig(BaseToolkitConfig):
                 logger.info(f"Stored RHCP offline token in database for user {user_id}")
             else:
                 # Fall back to in-memory storage (legacy)
-                if user_id not in self._user_configs:
-                    self._user_configs[user_id] = {}
-                self._user_configs[user_id]["rhcp_offline_token"] = offline_token
+                self._rhcp_tokens[user_id] = offline_token
                 logger.info(f"Stored RHCP offline token in memory for user {user_id}")
 
             # Store the toolkit for this user
             self._rhcp_toolkits[user_id] = toolkit
+            self._configured_users[user_id] = time.monotonic() + _CONFIGURED_TTL_SECS
 
             # Return confirmation with validation message
             return (
@@ -154,17 +240,7 @@ class RHCPConfig(BaseToolkitConfig):
         if self.is_configured(user_id):
             return None
 
-        return (
-            "🔑 **Red Hat Customer Portal (RHCP) Configuration Required**\n\n"
-            "To access customer case information, please provide your RHCP offline token:\n\n"
-            "Say: 'My RHCP offline token is YOUR_OFFLINE_TOKEN_HERE'\n\n"
-            "To get an RHCP offline token:\n"
-            "1. Go to https://access.redhat.com/management/api\n"
-            "2. Click 'Generate Token' under 'Offline Token'\n"
-            "3. Copy the token (it will be a long string)\n"
-            "4. Send it to me in the format above\n\n"
-            "See also: https://access.redhat.com/articles/3626371"
-        )
+        return _CONFIG_PROMPT
 
     def get_toolkit(self, user_id: str) -> RHCPTools | None:
         """Get RHCP toolkit for user if configured.
@@ -175,71 +251,44 @@ class RHCPConfig(BaseToolkitConfig):
         Returns:
             RHCPTools instance if configured, None otherwise
         """
-        # Return cached toolkit if available
-        if user_id in self._rhcp_toolkits:
+        # Return cached toolkit if available and the token is still stored
+        if user_id in self._rhcp_toolkits and self.is_configured(user_id):
             return self._rhcp_toolkits[user_id]
 
-        # If we have token but no toolkit (e.g., after restart), recreate it
-        if not self.is_configured(user_id):
-            return None
-
-        # Recreate toolkit from database or memory
-        toolkit = None
-        if self.token_storage:
-            # Get credentials from database
-            try:
-                token_data = self.token_storage.get_rhcp_token(user_id)
-                if not token_data:
-                    logger.error(f"No RHCP offline token found in database for user {user_id}")
-                    return None
-
-                toolkit = RHCPTools(
-                    offline_token=token_data["offline_token"],
-                    get_case=True,
-                    search_cases=True,
-                )
-                logger.info(f"Recreated RHCP toolkit from database for user {user_id}")
-            except Exception as e:
-                logger.error(f"Failed to create RHCP toolkit from database: {e}")
+        try:
+            # If we have token but no toolkit (e.g., after restart), recreate it
+            offline_token = self._load_offline_token(user_id)
+            if offline_token is None:
                 return None
-        else:
-            # Use legacy in-memory authentication
-            if user_id in self._user_configs and "rhcp_offline_token" in self._user_configs[user_id]:
-                offline_token = self._user_configs[user_id]["rhcp_offline_token"]
-                toolkit = RHCPTools(
-                    offline_token=offline_token,
-                    get_case=True,
-                    search_cases=True,
-                )
-                logger.info(f"Recreated RHCP toolkit (legacy) for user {user_id}")
 
-        if toolkit:
-            self._rhcp_toolkits[user_id] = toolkit
+            toolkit = RHCPTools(
+                offline_token=offline_token,
+                get_case=True,
+                search_cases=True,
+            )
+            logger.info(f"Recreated RHCP toolkit for user {user_id}")
+        except Exception as e:
+            logger.error(f"Failed to recreate RHCP toolkit for user {user_id}: {e}")
+            return None
+
+        self._rhcp_toolkits[user_id] = toolkit
 
         return toolkit
 
-    def check_authorization_request(self, message: str, user_id: str) -> str | None:
+    def check_authorization_request(self, message: str, user_id: str, message_lower: str | None = None) -> str | None:
         """Check if message requests RHCP access and prompt if needed.
 
         Args:
             message: User message
             user_id: User identifier
+            message_lower: Lowercased message shared by the caller (see _message_lower)
 
         Returns:
             RHCP token prompt if user needs to configure, None otherwise
         """
         # Check if message mentions RHCP or customer cases
-        rhcp_keywords = [
-            "rhcp",
-            "customer portal",
-            "customer case",
-            "case number",
-            "entitlement",
-            "access.redhat.com",
-        ]
-
-        message_lower = message.lower()
-        mentions_rhcp = any(keyword in message_lower for keyword in rhcp_keywords)
+        message_lower = self._message_lower(message, message_lower)
+        mentions_rhcp = any(keyword in message_lower for keyword in _RHCP_KEYWORDS)
 
         if not mentions_rhcp:
             return None
@@ -274,30 +323,8 @@ class RHCPConfig(BaseToolkitConfig):
         Returns:
             List of instruction strings
         """
-        if self.get_toolkit(user_id):
-            return [
-                "Red Hat Customer Portal (RHCP) Integration:",
-                "- CRITICAL: You NOW HAVE access to RHCP tools - any previous statements about not having RHCP access are outdated",
-                "- IMPORTANT: Your current capabilities include READ-ONLY access to customer case information",
-                "- Available tools that you MUST use when asked about customer cases:",
-                "  - get_case(case_number): Get detailed information about a specific customer case",
-                "  - search_cases(query, limit): Search for customer cases using queries",
-                "- Case data you can retrieve: severity, status, escalation status, entitlement level, SLA information",
-                "- ALWAYS use RHCP tools when asked about customer cases or case numbers - do not claim you lack access",
-                "- Track linked customer cases and provide full context from RHCP",
-                "- CRITICAL: Do NOT create, update, or modify customer cases - READ-ONLY access only",
-                "- Cross-reference JIRA issues with RHCP customer cases:",
-                "  * JIRA stores case numbers in customfield_12313441 (use cf[12313441] in JQL queries)",
-                "  * Example: Find JIRA issues for case 04312027: 'project = RHDHSUPP AND cf[12313441] = 04312027'",
-                "  * Then use get_case(case_number) to fetch RHCP case details",
-                "- Apply severity-to-priority mapping when analyzing issues:",
-                "  * Severity '1 (Urgent)' → Priority 'Critical'",
-                "  * Severity '2 (High)' → Priority 'Major'",
-                "  * Severity '3 (Normal)' → Priority 'Normal'",
-                "  * Severity '4 (Low)' → Priority 'Minor'",
-                "  * is_escalated=true → Priority 'Blocker' (overrides severity mapping)",
-                "- Include case severity and escalation status in your recommendations",
-            ]
+        if self.is_configured(user_id):
+            return list(_RHCP_INSTRUCTIONS)
         return []
 
     def is_required(self) -> bool:
@@ -308,43 +335,85 @@ class RHCPConfig(BaseToolkitConfig):
         """
         return False
 
+    def invalidate(self, user_id: str) -> None:
+        """Forget everything cached for a user.
+
+        Called when the user stores a new offline token, and when a cached
+        configured state expires and the token is no longer in storage, so a
+        replaced or deleted token doesn't keep its toolkit alive.
+
+        Args:
+            user_id: User identifier
+        """
+        self._configured_users.pop(user_id, None)
+        self._rhcp_tokens.pop(user_id, None)
+        if self._rhcp_toolkits.pop(user_id, None) is not None:
+            logger.info(f"Invalidated cached RHCP toolkit for user {user_id}")
+
     # Private helper methods
 
-    def _extract_rhcp_token(self, message: str) -> str | None:
+    def _load_offline_token(self, user_id: str) -> str | None:
+        """Get a user's RHCP offline token with a single storage lookup.
+
+        Args:
+            user_id: User identifier
+
+        Returns:
+            Offline token from the database, or from legacy in-memory storage,
+            or None if the user has no token
+        """
+        # Check database storage first (preferred)
+        if self.token_storage:
+            token_data = self.token_storage.get_rhcp_token(user_id)
+            if token_data:
+                self._configured_users[user_id] = time.monotonic() + _CONFIGURED_TTL_SECS
+                return token_data["offline_token"]
+
+        # Fall back to legacy in-memory storage
+        offline_token = self._rhcp_tokens.get(user_id)
+        if offline_token:
+            self._configured_users[user_id] = time.monotonic() + _CONFIGURED_TTL_SECS
+            return offline_token
+
+        return None
+
+    def _extract_rhcp_token(self, message: str, message_lower: str | None = None) -> str | None:
         """Extract RHCP offline token from user message.
 
         Args:
             message: User message text
+            message_lower: Lowercased message, if already computed (see _message_lower)
 
         Returns:
             Extracted offline token or None if not found
         """
-        # Create flexible regex patterns for explicit mentions
-        patterns = [
-            # "my rhcp token is VALUE"
-            r"(?:my\s+)?rhcp\s+(?:offline\s+)?token\s+(?:is|=|:)\s+([^\s]+)",
-            # "set rhcp token to VALUE"
-            r"set\s+rhcp\s+(?:offline\s+)?token\s+to\s+([^\s]+)",
-            # "rhcp token: VALUE"
-            r"rhcp\s+(?:offline\s+)?token:\s*([^\s]+)",
-            # "my offline token is VALUE"
-            r"(?:my\s+)?offline\s+token\s+(?:is|=|:)\s+([^\s]+)",
-        ]
-
-        for pattern in patterns:
-            match = re.search(pattern, message, re.IGNORECASE)
-            if match:
-                return match.group(1)
+        # The explicit-mention patterns all need the word "token"
+        message_lower = self._message_lower(message, message_lower)
+        if "token" in message_lower:
+            if len(message_lower) == len(message):
+                # Same offsets in both: match lowercase, slice the original token
+                for pattern in _TOKEN_PATTERNS:
+                    match = pattern.search(message_lower)
+                    if match:
+                        return message[match.start(1) : match.end(1)]
+            else:
+                for pattern in _TOKEN_PATTERNS_ANY_CASE:
+                    match = pattern.search(message)
+                    if match:
+                        return match.group(1)
 
         # Try to detect standalone long tokens (100+ characters)
-        # RHCP offline tokens are typically very long (200+ chars)
-        # Format: eyJhbGciOiJIUzI1NiIsInR5cCIgOiAiSldUIiwia2lkIiA6ICJhZD...
-        token_pattern = r"(?:^|\s)([A-Za-z0-9_\-\.]{100,})(?:\s|$)"
-        match = re.search(token_pattern, message)
-        if match:
-            potential_token = match.group(1)
-            # RHCP tokens typically start with "eyJ" (base64 JWT header)
-            if potential_token.startswith("eyJ"):
-                return potential_token
+        if len(message) < _STANDALONE_TOKEN_MIN_LEN:
+            return None
+
+        start = message.find(_STANDALONE_TOKEN_PREFIX)
+        while start >= 0:
+            if start == 0 or message[start - 1].isspace():
+                match = _STANDALONE_TOKEN_RE.match(message, start)
+                if match:
+                    end = match.end()
+                    if end == len(message) or message[end].isspace():
+                        return match.group()
+            start = message.find(_STANDALONE_TOKEN_PREFIX, start + 1)
 
         return None
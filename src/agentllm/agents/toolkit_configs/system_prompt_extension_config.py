@@ -65,6 +65,23 @@ class SystemPromptExtensionConfig(BaseToolkitConfig):
         # Per-user cache of fetched system prompts
         self._system_prompts: dict[str, str] = {}
 
+        # Metadata about the external prompt source, prepended to the fetched prompt
+        self._instruction_prefix = (
+            "",
+            "=== EXTENDED SYSTEM PROMPT (from Google Drive) ===",
+            f"Source: {self._doc_url}",
+            "",
+            "NOTE: Users can update this external prompt by editing the Google Doc directly.",
+            "If release context seems outdated, you should:",
+            "1. Inform the user about the external prompt document",
+            "2. Provide the document URL above",
+            "3. Suggest they update it with current release information",
+            "",
+            "Extended instructions below:",
+            "---",
+            "",
+        )
+
         if self._doc_url:
             logger.info(f"System prompt extension configured with document: {self._doc_url} (from {self._source})")
         else:
@@ -90,7 +107,7 @@ class SystemPromptExtensionConfig(BaseToolkitConfig):
         # Document URL is set, check if GDrive is configured
         return self._gdrive_config.is_configured(user_id)
 
-    def extract_and_store_config(self, message: str, user_id: str) -> str | None:
+    def extract_and_store_config(self, message: str, user_id: str, message_lower: str | None = None) -> str | None:
         """Try to extract configuration from user message.
 
         System prompt extension has no extractable configuration from messages.
@@ -99,6 +116,7 @@ class SystemPromptExtensionConfig(BaseToolkitConfig):
         Args:
             message: User message
             user_id: User identifier
+            message_lower: Lowercased message shared by the caller (see _message_lower)
 
         Returns:
             None (no configuration to extract)
@@ -133,7 +151,7 @@ class SystemPromptExtensionConfig(BaseToolkitConfig):
         """
         return None
 
-    def check_authorization_request(self, message: str, user_id: str) -> str | None:
+    def check_authorization_request(self, message: str, user_id: str, message_lower: str | None = None) -> str | None:
         """Check if message requests this toolkit and handle authorization.
 
         System prompt extension doesn't require separate authorization.
@@ -142,6 +160,7 @@ class SystemPromptExtensionConfig(BaseToolkitConfig):
         Args:
             message: User message
             user_id: User identifier
+            message_lower: Lowercased message shared by the caller (see _message_lower)
 
         Returns:
             None (no authorization needed)
@@ -197,24 +216,7 @@ class SystemPromptExtensionConfig(BaseToolkitConfig):
             logger.info(f"Successfully fetched extended system prompt for user {user_id}")
 
             # Prepend metadata about the external prompt source
-            instructions = [
-                "",
-                "=== EXTENDED SYSTEM PROMPT (from Google Drive) ===",
-                f"Source: {self._doc_url}",
-                "",
-                "NOTE: Users can update this external prompt by editing the Google Doc directly.",
-                "If release context seems outdated, you should:",
-                "1. Inform the user about the external prompt document",
-                "2. Provide the document URL above",
-                "3. Suggest they update it with current release information",
-                "",
-                "Extended instructions below:",
-                "---",
-                "",
-                extended_prompt,
-            ]
-
-            return instructions
+            return [*self._instruction_prefix, extended_prompt]
         except Exception as e:
             logger.error(f"Failed to fetch extended system prompt for user {user_id}: {e}")
             # Re-raise to fail agent creation
@@ -237,9 +239,10 @@ class SystemPromptExtensionConfig(BaseToolkitConfig):
             Exception: If document fetch fails
         """
         # Check cache first
-        if user_id in self._system_prompts:
+        cached = self._system_prompts.get(user_id)
+        if cached is not None:
             logger.debug(f"Using cached system prompt for user {user_id}")
-            return self._system_prompts[user_id]
+            return cached
 
         # Validate prerequisites
         if not self._doc_url:
@@ -281,8 +284,7 @@ class SystemPromptExtensionConfig(BaseToolkitConfig):
         Args:
             user_id: User identifier
         """
-        if user_id in self._system_prompts:
+        if self._system_prompts.pop(user_id, None) is not None:
             logger.info(f"Invalidating cached system prompt for user {user_id} due to Google Drive credential change")
-            del self._system_prompts[user_id]
         else:
             logger.debug(f"No cached system prompt to invalidate for user {user_id}")
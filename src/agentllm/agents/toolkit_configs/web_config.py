@@ -4,8 +4,6 @@ This configuration provides web scraping capabilities for accessing
 public documentation pages, particularly Red Hat documentation.
 """
 
-from loguru import logger
-
 from agentllm.tools.web_toolkit import WebToolkit
 
 from .base import BaseToolkitConfig
@@ -27,7 +25,26 @@ class WebConfig(BaseToolkitConfig):
         """
         super().__init__(token_storage=None)  # No token storage needed
         self._allowed_domains = allowed_domains or ["*.redhat.com"]
-        self._web_toolkit: WebToolkit | None = None
+
+        # The toolkit needs no credentials and is shared by all users. It is
+        # cheap to build, so create it up front rather than on first use.
+        self._web_toolkit = WebToolkit(
+            fetch_url=True,
+        )
+
+        # Agent instructions only depend on the allowed domains
+        self._instructions = (
+            "Web Access Tools:",
+            "- You have access to fetch content from public web pages",
+            "- Available tool: fetch_url(url, extract_text=True)",
+            "- Use this to access Red Hat documentation pages like:",
+            "  * RHDH Lifecycle: https://access.redhat.com/support/policy/updates/developerhub",
+            "  * Red Hat severity definitions: https://access.redhat.com/support/policy/severity",
+            "  * Red Hat SLA policy: https://access.redhat.com/support/offerings/production/sla",
+            f"- Allowed domains: {', '.join(self._allowed_domains)}",
+            "- The tool extracts readable text from HTML by default",
+            "- Use extract_text=False if you need raw HTML content",
+        )
 
     def is_configured(self, user_id: str) -> bool:
         """Check if web access is configured.
@@ -42,7 +59,7 @@ class WebConfig(BaseToolkitConfig):
         """
         return True
 
-    def extract_and_store_config(self, message: str, user_id: str) -> str | None:
+    def extract_and_store_config(self, message: str, user_id: str, message_lower: str | None = None) -> str | None:
         """Extract and store configuration from user message.
 
         Web access requires no configuration.
@@ -50,6 +67,7 @@ class WebConfig(BaseToolkitConfig):
         Args:
             message: User message (unused)
             user_id: User identifier (unused)
+            message_lower: Lowercased message shared by the caller (see _message_lower)
 
         Returns:
             None (no configuration needed)
@@ -78,15 +96,9 @@ class WebConfig(BaseToolkitConfig):
         Returns:
             WebToolkit instance
         """
-        if self._web_toolkit is None:
-            logger.info("Creating WebToolkit instance")
-            self._web_toolkit = WebToolkit(
-                fetch_url=True,
-            )
-
         return self._web_toolkit
 
-    def check_authorization_request(self, message: str, user_id: str) -> str | None:
+    def check_authorization_request(self, message: str, user_id: str, message_lower: str | None = None) -> str | None:
         """Check if message requests web access.
 
         Web access requires no authorization.
@@ -94,6 +106,7 @@ class WebConfig(BaseToolkitConfig):
         Args:
             message: User message (unused)
             user_id: User identifier (unused)
+            message_lower: Lowercased message shared by the caller (see _message_lower)
 
         Returns:
             None (no authorization needed)
@@ -122,18 +135,7 @@ class WebConfig(BaseToolkitConfig):
         Returns:
             List of instruction strings
         """
-        return [
-            "Web Access Tools:",
-            "- You have access to fetch content from public web pages",
-            "- Available tool: fetch_url(url, extract_text=True)",
-            "- Use this to access Red Hat documentation pages like:",
-            "  * RHDH Lifecycle: https://access.redhat.com/support/policy/updates/developerhub",
-            "  * Red Hat severity definitions: https://access.redhat.com/support/policy/severity",
-            "  * Red Hat SLA policy: https://access.redhat.com/support/offerings/production/sla",
-            f"- Allowed domains: {', '.join(self._allowed_domains)}",
-            "- The tool extracts readable text from HTML by default",
-            "- Use extract_text=False if you need raw HTML content",
-        ]
+        return list(self._instructions)
 
     def is_required(self) -> bool:
         """Check if this toolkit is required.
@@ -1,9 +1,13 @@
 """Custom LiteLLM handler for Agno provider using dynamic registration."""
 
+import asyncio
 import os
 import sys
+import threading
+from collections import OrderedDict
 from collections.abc import AsyncIterator, Iterator
 from pathlib import Path
+from types import MappingProxyType
 from typing import Any
 
 import litellm
@@ -24,20 +28,27 @@ logger.remove()
 log_dir = os.getenv("AGENTLLM_DATA_DIR", "tmp")
 log_file = Path(log_dir) / "agno_handler.log"
 
-# Add file handler for detailed logs (DEBUG level)
+# Add file handler for detailed logs (LOG_LEVEL, INFO by default). Debug calls
+# below pass their values as arguments, so they are only formatted when enabled.
+# Records are enqueued and written (and rotated) by loguru's worker thread, so
+# logging from acompletion()/astreaming() doesn't block the event loop on disk I/O.
 logger.add(
     log_file,
-    level="DEBUG",
+    level=os.getenv("LOG_LEVEL", "INFO").upper(),
     format="{time:YYYY-MM-DD HH:mm:ss.SSS} | {level: <8} | {name}:{function}:{line} - {message}",
     rotation="10 MB",
     retention="7 days",
+    enqueue=True,
 )
 
-# Add console handler for important logs only (INFO level)
+# Add console handler for important logs only (INFO level), also written from
+# loguru's worker thread: stderr can block when its reader (e.g. a container
+# log collector) falls behind
 logger.add(
     sys.stderr,
     level="INFO",
     format="<green>{time:YYYY-MM-DD HH:mm:ss.SSS}</green> | <level>{level: <8}</level> | <cyan>{name}</cyan>:<cyan>{function}</cyan> - <level>{message}</level>",
+    enqueue=True,
 )
 
 # Shared database for all agents to enable session management
@@ -54,6 +65,135 @@ agent_registry = AgentRegistry()
 agent_registry.discover_agents()
 logger.info(f"Agent registry initialized. Discovered agents: {agent_registry.list_agents()}")
 
+# Where session and user IDs are looked up, in priority order, as
+# (source, keys) pairs. Header names are matched lowercased.
+# - body metadata: request body metadata (from OpenWebUI pipe functions)
+# - headers: OpenWebUI headers (ENABLE_FORWARD_USER_INFO_HEADERS)
+# - LiteLLM metadata
+# - request: the OpenAI "user" field
+_SESSION_ID_PROBES = (
+    ("body metadata", ("session_id", "chat_id")),
+    ("headers", ("x-openwebui-chat-id",)),
+    ("LiteLLM metadata", ("session_id", "conversation_id")),
+)
+_USER_ID_PROBES = (
+    ("body metadata", ("user_id",)),
+    ("headers", ("x-openwebui-user-id", "x-openwebui-user-email")),
+    ("request", ("user",)),
+)
+
+# Default for missing request sections, so lookups don't allocate empty dicts
+_EMPTY: MappingProxyType = MappingProxyType({})
+
+
+def _probe(sources: dict[str, dict[str, Any]], probes: tuple[tuple[str, tuple[str, ...]], ...]) -> tuple[Any, str | None]:
+    """Find the first non-empty value for a list of (source, keys) probes.
+
+    Args:
+        sources: Lookup dicts by source name
+        probes: (source name, keys) pairs, in priority order
+
+    Returns:
+        Tuple of (value, source name), or (None, None) if no probe matched
+    """
+    for source_name, keys in probes:
+        source = sources[source_name]
+        if source:
+            for key in keys:
+                value = source.get(key)
+                if value:
+                    return value, source_name
+    return None, None
+
+
+# Most agents kept in AgnoCustomLLM._agent_cache; the least recently used one
+# is evicted beyond that. Conversation history lives in shared_db, so an evicted
+# agent is simply recreated on the user's next request.
+_AGENT_CACHE_MAX_SIZE = 512
+
+
+def _response_content(response: Any) -> Any:
+    """Get the content of an agent run response.
+
+    Args:
+        response: Agent run response
+
+    Returns:
+        The response's content attribute, or the response as a string if it has none
+    """
+    try:
+        return response.content
+    except AttributeError:
+        return str(response)
+
+
+# Marks the end of an agent stream in _coalesce_text_chunks' queue
+_STREAM_END = object()
+
+# Most chunks _coalesce_text_chunks reads ahead of its consumer; once this many
+# are waiting the agent stream is not read further until the consumer catches up
+_COALESCE_MAX_BUFFERED_CHUNKS = 256
+
+
+def _is_text_chunk(chunk: dict[str, Any]) -> bool:
+    """Check if a streaming chunk only carries text, so it can be merged with its neighbours."""
+    return not chunk.get("is_finished") and chunk.get("finish_reason") is None and chunk.get("tool_use") is None
+
+
+async def _coalesce_text_chunks(stream: AsyncIterator[dict[str, Any]]) -> AsyncIterator[dict[str, Any]]:
+    """Merge text chunks that are already waiting into a single chunk.
+
+    The agent stream is drained by a background task, at most
+    _COALESCE_MAX_BUFFERED_CHUNKS ahead of the consumer. Whenever the consumer
+    asks for the next chunk, every text chunk that has arrived in the meantime
+    is joined into one, so a slow consumer gets fewer, larger chunks instead
+    of one per token. Other chunks (final, tool use) are passed through as is
+    and in order.
+
+    Args:
+        stream: GenericStreamingChunk dictionaries from the agent
+
+    Yields:
+        GenericStreamingChunk dictionaries, with adjacent text chunks merged
+    """
+    queue: asyncio.Queue = asyncio.Queue(maxsize=_COALESCE_MAX_BUFFERED_CHUNKS)
+
+    async def pump() -> None:
+        try:
+            async for chunk in stream:
+                await queue.put(chunk)
+        except Exception as e:
+            await queue.put(e)
+            return
+        await queue.put(_STREAM_END)
+
+    pump_task = asyncio.create_task(pump())
+    try:
+        item = await queue.get()
+        while item is not _STREAM_END:
+            if isinstance(item, Exception):
+                raise item
+
+            if not _is_text_chunk(item):
+                yield item
+                item = await queue.get()
+                continue
+
+            # Join the text chunks that are already queued behind this one
+            texts = [item["text"]]
+            next_item = None
+            while not queue.empty():
+                queued = queue.get_nowait()
+                if queued is _STREAM_END or isinstance(queued, Exception) or not _is_text_chunk(queued):
+                    next_item = queued
+                    break
+                texts.append(queued["text"])
+
+            yield item if len(texts) == 1 else {**item, "text": "".join(texts)}
+            item = next_item if next_item is not None else await queue.get()
+    finally:
+        pump_task.cancel()
+
 
 class AgnoCustomLLM(CustomLLM):
     """Custom LiteLLM handler for Agno agents.
@@ -65,8 +205,17 @@ class AgnoCustomLLM(CustomLLM):
     def __init__(self):
         """Initialize the custom LLM handler with agent cache."""
         super().__init__()
-        # Cache agents by (agent_name, temperature, max_tokens, user_id)
-        self._agent_cache: dict[tuple, Any] = {}
+        # Cache agents by (agent_name, temperature, max_tokens, user_id, session_id),
+        # in least recently used order (bounded by _AGENT_CACHE_MAX_SIZE)
+        self._agent_cache: OrderedDict[tuple, Any] = OrderedDict()
+        # Guards _agent_cache and the per-key lock bookkeeping; held only for dict operations
+        self._agent_cache_lock = threading.Lock()
+        # Held while creating the agent for a key, so concurrent misses for
+        # that key build it once without blocking requests for other keys.
+        # Each lock is kept until no request holds or waits for it, so a failed
+        # creation can't let a newcomer build alongside a waiting request.
+        self._agent_key_locks: dict[tuple, threading.Lock] = {}
+        self._agent_key_waiters: dict[tuple, int] = {}
         logger.info("Initialized AgnoCustomLLM with agent caching")
 
     def _extract_session_info(self, kwargs: dict[str, Any]) -> tuple[str | None, str | None]:
@@ -85,51 +234,26 @@ class AgnoCustomLLM(CustomLLM):
             Tuple of (session_id, user_id)
         """
         logger.debug("_extract_session_info() called")
-        session_id = None
-        user_id = None
-
-        # 1. Check request body for metadata (from OpenWebUI pipe functions)
-        litellm_params = kwargs.get("litellm_params", {})
-        proxy_request = litellm_params.get("proxy_server_request", {})
-        request_body = proxy_request.get("body", {})
-        body_metadata = request_body.get("metadata", {})
-
-        if body_metadata:
-            session_id = body_metadata.get("session_id") or body_metadata.get("chat_id")
-            user_id = body_metadata.get("user_id")
-            logger.info(f"[1/4] Found in body metadata: session_id={session_id}, user_id={user_id}")
-
-        # 2. Check OpenWebUI headers (ENABLE_FORWARD_USER_INFO_HEADERS)
-        headers = litellm_params.get("metadata", {}).get("headers", {})
-        if not session_id and headers:
-            # Check for chat_id header (might be X-OpenWebUI-Chat-Id)
-            session_id = headers.get("x-openwebui-chat-id") or headers.get("X-OpenWebUI-Chat-Id")
-            if session_id:
-                logger.info(f"[2/4] Found in headers: session_id={session_id}")
-
-        if not user_id and headers:
-            # Check for user_id header
-            user_id = (
-                headers.get("x-openwebui-user-id")
-                or headers.get("X-OpenWebUI-User-Id")
-                or headers.get("x-openwebui-user-email")
-                or headers.get("X-OpenWebUI-User-Email")
-            )
-            if user_id:
-                logger.info(f"[2/4] Found in headers: user_id={user_id}")
-
-        # 3. Check LiteLLM metadata
-        if not session_id and "litellm_params" in kwargs:
-            litellm_metadata = litellm_params.get("metadata", {})
-            session_id = litellm_metadata.get("session_id") or litellm_metadata.get("conversation_id")
-            if session_id:
-                logger.info(f"[3/4] Found in LiteLLM metadata: session_id={session_id}")
-
-        # 4. Fallback to user field
-        if not user_id:
-            user_id = kwargs.get("user")
-            if user_id:
-                logger.info(f"[4/4] Found in user field: user_id={user_id}")
+
+        litellm_params = kwargs.get("litellm_params", _EMPTY)
+        litellm_metadata = litellm_params.get("metadata", _EMPTY)
+        body_metadata = litellm_params.get("proxy_server_request", _EMPTY).get("body", _EMPTY).get("metadata", _EMPTY)
+        headers = litellm_metadata.get("headers", _EMPTY)
+
+        sources = {
+            "body metadata": body_metadata,
+            "headers": {name.lower(): value for name, value in headers.items()} if headers else headers,
+            "LiteLLM metadata": litellm_metadata,
+            "request": kwargs,
+        }
+
+        session_id, session_source = _probe(sources, _SESSION_ID_PROBES)
+        if session_id:
+            logger.debug("Found in {}: session_id={}", session_source, session_id)
+
+        user_id, user_source = _probe(sources, _USER_ID_PROBES)
+        if user_id:
+            logger.debug("Found in {}: user_id={}", user_source, user_id)
 
         # Log what we're using
         logger.info(f"✓ Final extracted session info: user_id={user_id}, session_id={session_id}")
@@ -139,7 +263,7 @@ class AgnoCustomLLM(CustomLLM):
             logger.warning("⚠ No session/user info found! Logging full request structure:")
             logger.warning(f"Headers available: {list(headers.keys()) if headers else 'None'}")
             logger.warning(f"Body metadata keys: {list(body_metadata.keys()) if body_metadata else 'None'}")
-            logger.warning(f"LiteLLM metadata keys: {list(litellm_params.get('metadata', {}).keys())}")
+            logger.warning(f"LiteLLM metadata keys: {list(litellm_metadata.keys())}")
 
         return session_id, user_id
 
@@ -160,26 +284,91 @@ class AgnoCustomLLM(CustomLLM):
         Raises:
             Exception: If agent not found
         """
-        logger.debug(f"_get_agent() called with model={model}, user_id={user_id}, session_id={session_id}")
+        logger.debug("_get_agent() called with model={}, user_id={}, session_id={}", model, user_id, session_id)
 
         # Extract agent name from model (handle both "agno/release-manager" and "release-manager")
-        agent_name = model.replace("agno/", "")
-        logger.debug(f"Extracted agent_name: {agent_name}")
+        agent_name = model.removeprefix("agno/")
+        logger.debug("Extracted agent_name: {}", agent_name)
 
         # Extract OpenAI parameters to pass to agent
         temperature = kwargs.get("temperature")
         max_tokens = kwargs.get("max_tokens")
-        logger.debug(f"Agent parameters: temperature={temperature}, max_tokens={max_tokens}, session_id={session_id}")
+        logger.debug("Agent parameters: temperature={}, max_tokens={}, session_id={}", temperature, max_tokens, session_id)
 
         # Build cache key from agent configuration, user_id, and session_id
         # Each user+session combination gets its own wrapper instance
         cache_key = (agent_name, temperature, max_tokens, user_id, session_id)
 
         # Check if agent exists in cache
-        if cache_key in self._agent_cache:
+        with self._agent_cache_lock:
+            agent = self._agent_cache.get(cache_key)
+            if agent is not None:
+                self._agent_cache.move_to_end(cache_key)
+            else:
+                key_lock = self._agent_key_locks.setdefault(cache_key, threading.Lock())
+                self._agent_key_waiters[cache_key] = self._agent_key_waiters.get(cache_key, 0) + 1
+        if agent is not None:
             logger.info(f"✓ Using CACHED agent for key: {cache_key}")
-            return self._agent_cache[cache_key]
+            return agent
+
+        try:
+            with key_lock:
+                # Another request may have created the agent while we waited
+                with self._agent_cache_lock:
+                    agent = self._agent_cache.get(cache_key)
+                if agent is not None:
+                    logger.info(f"✓ Using agent created by a concurrent request for key: {cache_key}")
+                    return agent
+
+                agent = self._create_agent(cache_key, agent_name, temperature, max_tokens, user_id, session_id)
+                with self._agent_cache_lock:
+                    self._agent_cache[cache_key] = agent
+                    evicted_key = None
+                    if len(self._agent_cache) > _AGENT_CACHE_MAX_SIZE:
+                        evicted_key, _ = self._agent_cache.popitem(last=False)
+                    cache_size = len(self._agent_cache)
+                    logger.opt(lazy=True).debug("Cache keys: {}", lambda: list(self._agent_cache.keys()))
+        finally:
+            with self._agent_cache_lock:
+                waiters = self._agent_key_waiters.pop(cache_key) - 1
+                if waiters:
+                    self._agent_key_waiters[cache_key] = waiters
+                else:
+                    del self._agent_key_locks[cache_key]
+
+        if evicted_key is not None:
+            logger.info(f"Evicted least recently used agent for key: {evicted_key}")
+        logger.info(f"✓ Agent cached. Total cached agents: {cache_size}")
+        return agent
+
+    def _create_agent(
+        self,
+        cache_key: tuple,
+        agent_name: str,
+        temperature: float | None,
+        max_tokens: int | None,
+        user_id: str | None,
+        session_id: str | None,
+    ):
+        """Create an agent via the registry.
+
+        Called with the per-key lock for cache_key held, but not
+        _agent_cache_lock, so slow agent construction doesn't block other keys.
 
+        Args:
+            cache_key: Agent cache key
+            agent_name: Registered agent name
+            temperature: Model temperature
+            max_tokens: Model max tokens
+            user_id: User ID for agent isolation
+            session_id: Session ID for conversation isolation
+
+        Returns:
+            Newly created agent instance
+
+        Raises:
+            Exception: If agent not found
+        """
         # Create new agent and cache it
         logger.info(f"✗ Cache MISS - Creating NEW agent for key: {cache_key}")
 
@@ -192,7 +381,7 @@ class AgnoCustomLLM(CustomLLM):
         factory = agent_registry.get_factory(agent_name)
 
         if factory:
-            logger.debug(f"Creating agent '{agent_name}' via registry factory...")
+            logger.debug("Creating agent '{}' via registry factory...", agent_name)
             agent = factory.create_agent(
                 shared_db=shared_db,
                 token_storage=token_storage,
@@ -201,7 +390,7 @@ class AgnoCustomLLM(CustomLLM):
                 temperature=temperature,
                 max_tokens=max_tokens,
             )
-            logger.debug(f"Agent '{agent_name}' instantiated successfully via factory")
+            logger.debug("Agent '{}' instantiated successfully via factory", agent_name)
         else:
             # Agent not found
             available_agents = agent_registry.list_agents()
@@ -209,9 +398,6 @@ class AgnoCustomLLM(CustomLLM):
             logger.error(error_msg)
             raise Exception(error_msg)
 
-        self._agent_cache[cache_key] = agent
-        logger.info(f"✓ Agent cached. Total cached agents: {len(self._agent_cache)}")
-        logger.debug(f"Cache keys: {list(self._agent_cache.keys())}")
         return agent
 
     def _build_response(self, model: str, content: str) -> ModelResponse:
@@ -225,27 +411,21 @@ class AgnoCustomLLM(CustomLLM):
             ModelResponse object
         """
         logger.info(f"_build_response() called for model={model}, content_length={len(content)}")
-        logger.debug(safe_log_content(content, "Content being added to response"))
+        logger.opt(lazy=True).debug("{}", lambda: safe_log_content(content, "Content being added to response"))
 
         message = Message(role="assistant", content=content)
-        logger.debug(f"Created Message object: role={message.role}, content_length={len(message.content) if message.content else 0}")
+        logger.debug("Created Message object: role={}, content_length={}", message.role, len(message.content) if message.content else 0)
 
         choice = Choices(finish_reason="stop", index=0, message=message)
-        logger.debug(f"Created Choices object with finish_reason={choice.finish_reason}")
-
-        model_response = ModelResponse()
-        model_response.model = model
-        model_response.choices = [choice]
-        model_response.usage = {
-            "prompt_tokens": 0,
-            "completion_tokens": 0,
-            "total_tokens": 0,
-        }
+        logger.debug("Created Choices object with finish_reason={}", choice.finish_reason)
+
+        # Pass model and choices to the constructor rather than assigning them
+        # afterwards, which builds (and discards) a default choice first. The
+        # agent doesn't report token counts: keep ModelResponse's default zero usage.
+        model_response = ModelResponse(model=model, choices=[choice])
 
         logger.info(f"ModelResponse built: model={model_response.model}, choices_count={len(model_response.choices)}")
-        logger.debug(
-            f"Response first choice content: {model_response.choices[0].message.content[:200] if model_response.choices[0].message.content else 'None'}"
-        )
+        logger.opt(lazy=True).debug("Response first choice content: {}", lambda: content[:200] if content else "None")
         return model_response
 
     def _extract_request_params(self, messages: list[dict[str, Any]], kwargs: dict[str, Any]) -> tuple[str, str | None, str | None]:
@@ -260,11 +440,34 @@ class AgnoCustomLLM(CustomLLM):
         """
         logger.debug("_extract_request_params() called")
         user_message = self._extract_user_message(messages)
-        logger.debug(f"Extracted user_message (length={len(user_message)})")
+        logger.debug("Extracted user_message (length={})", len(user_message))
         session_id, user_id = self._extract_session_info(kwargs)
-        logger.debug(f"Extracted session_id={session_id}, user_id={user_id}")
+        logger.debug("Extracted session_id={}, user_id={}", session_id, user_id)
         return user_message, session_id, user_id
 
+    def _prepare_request(
+        self, model: str, messages: list[dict[str, Any]], kwargs: dict[str, Any]
+    ) -> tuple[Any, str, str | None, str | None]:
+        """Extract request parameters and get the agent that serves the request.
+
+        Args:
+            model: Model name
+            messages: OpenAI-format messages
+            kwargs: Request parameters
+
+        Returns:
+            Tuple of (agent, user_message, session_id, user_id)
+        """
+        logger.info("Extracting request parameters...")
+        # Extract request parameters first (need user_id for agent cache)
+        user_message, session_id, user_id = self._extract_request_params(messages, kwargs)
+        logger.info(f"Extracted: user_message_length={len(user_message)}, session_id={session_id}, user_id={user_id}")
+
+        logger.info("Getting agent instance...")
+        # Get agent instance (with caching based on user_id and session_id)
+        agent = self._get_agent(model, user_id=user_id, session_id=session_id, **kwargs)
+        return agent, user_message, session_id, user_id
+
     def completion(
         self,
         model: str,
@@ -287,8 +490,8 @@ class AgnoCustomLLM(CustomLLM):
         """
         logger.info("=" * 80)
         logger.info(f">>> completion() STARTED - model={model}")
-        logger.info(f"kwargs: {kwargs}")
-        logger.info(f"messages: {messages}")
+        logger.debug("kwargs: {}", kwargs)
+        logger.debug("messages: {}", messages)
 
         # Check if streaming is requested
         stream = kwargs.get("stream", False)
@@ -303,14 +506,7 @@ class AgnoCustomLLM(CustomLLM):
                 **kwargs,
             )
 
-        logger.info("Extracting request parameters...")
-        # Extract request parameters first (need user_id for agent cache)
-        user_message, session_id, user_id = self._extract_request_params(messages, kwargs)
-        logger.info(f"Extracted: user_message_length={len(user_message)}, session_id={session_id}, user_id={user_id}")
-
-        logger.info("Getting agent instance...")
-        # Get agent instance (with caching based on user_id and session_id)
-        agent = self._get_agent(model, user_id=user_id, session_id=session_id, **kwargs)
+        agent, user_message, session_id, user_id = self._prepare_request(model, messages, kwargs)
 
         logger.info(f"Running agent with session_id={session_id}, user_id={user_id}")
         # Run the agent with session management
@@ -318,11 +514,13 @@ class AgnoCustomLLM(CustomLLM):
         logger.info(f"Agent run completed, response type: {type(response)}")
 
         # Extract content and build response
-        content = response.content if hasattr(response, "content") else str(response)
+        content = _response_content(response)
         logger.info(f"Extracted content length: {len(content) if content else 0}")
         logger.info(f"Content type: {type(content)}")
-        logger.info(safe_log_content(content, "Content value"))
-        logger.debug(f"Response object attributes: {vars(response) if hasattr(response, '__dict__') else dir(response)}")
+        logger.opt(lazy=True).info("{}", lambda: safe_log_content(content, "Content value"))
+        logger.opt(lazy=True).debug(
+            "Response object attributes: {}", lambda: vars(response) if hasattr(response, "__dict__") else dir(response)
+        )
 
         result = self._build_response(model, str(content))
         logger.info(f"<<< completion() FINISHED - model={model}")
@@ -344,6 +542,10 @@ class AgnoCustomLLM(CustomLLM):
         For true streaming with tool call visibility and reasoning events,
         use async requests which will call astreaming().
 
+        The agent runs through its sync API (agent.run), never on an event
+        loop of its own: cached agents hold loop-bound resources (async HTTP
+        clients) tied to the loop serving astreaming().
+
         Args:
             model: Model name
             messages: OpenAI-format messages
@@ -354,12 +556,9 @@ class AgnoCustomLLM(CustomLLM):
         Yields:
             GenericStreamingChunk dictionary with text field
         """
-        logger.info("=" * 80)
         logger.info(f">>> streaming() STARTED - model={model}")
-        logger.info(f"kwargs: {kwargs}")
 
         logger.info("Getting complete response via completion() (sync streaming not fully supported)")
-        # Get the complete response
         result = self.completion(
             model=model,
             messages=messages,
@@ -367,29 +566,19 @@ class AgnoCustomLLM(CustomLLM):
             custom_llm_provider=custom_llm_provider,
             **{k: v for k, v in kwargs.items() if k != "stream"},
         )
-
-        # Extract content from the ModelResponse
-        content = ""
-        if result.choices and len(result.choices) > 0:
-            content = result.choices[0].message.content or ""
+        content = result.choices[0].message.content or ""
 
         logger.info(f"Yielding single streaming chunk with content_length={len(content)}")
         # Return as GenericStreamingChunk format (required by CustomLLM interface)
-        chunk = {
+        yield {
             "text": content,
             "finish_reason": "stop",
             "index": 0,
             "is_finished": True,
             "tool_use": None,
-            "usage": {
-                "completion_tokens": (result.usage.get("completion_tokens", 0) if result.usage else 0),
-                "prompt_tokens": (result.usage.get("prompt_tokens", 0) if result.usage else 0),
-                "total_tokens": (result.usage.get("total_tokens", 0) if result.usage else 0),
-            },
+            "usage": {"completion_tokens": 0, "prompt_tokens": 0, "total_tokens": 0},
         }
-        yield chunk
         logger.info(f"<<< streaming() FINISHED - model={model}")
-        logger.info("=" * 80)
 
     async def acompletion(
         self,
@@ -413,17 +602,10 @@ class AgnoCustomLLM(CustomLLM):
         """
         logger.info("=" * 80)
         logger.info(f">>> acompletion() STARTED - model={model}")
-        logger.info(f"kwargs: {kwargs}")
-        logger.info(f"messages: {messages}")
+        logger.debug("kwargs: {}", kwargs)
+        logger.debug("messages: {}", messages)
 
-        logger.info("Extracting request parameters...")
-        # Extract request parameters first (need user_id for agent cache)
-        user_message, session_id, user_id = self._extract_request_params(messages, kwargs)
-        logger.info(f"Extracted: user_message_length={len(user_message)}, session_id={session_id}, user_id={user_id}")
-
-        logger.info("Getting agent instance...")
-        # Get agent instance (with caching based on user_id and session_id)
-        agent = self._get_agent(model, user_id=user_id, session_id=session_id, **kwargs)
+        agent, user_message, session_id, user_id = self._prepare_request(model, messages, kwargs)
 
         logger.info(f"Running agent asynchronously with session_id={session_id}, user_id={user_id}")
         # Run the agent asynchronously with session management
@@ -431,11 +613,13 @@ class AgnoCustomLLM(CustomLLM):
         logger.info(f"Agent arun completed, response type: {type(response)}")
 
         # Extract content and build response
-        content = response.content if hasattr(response, "content") else str(response)
+        content = _response_content(response)
         logger.info(f"Extracted content length: {len(content) if content else 0}")
         logger.info(f"Content type: {type(content)}")
-        logger.info(safe_log_content(content, "Content value"))
-        logger.debug(f"Response object attributes: {vars(response) if hasattr(response, '__dict__') else dir(response)}")
+        logger.opt(lazy=True).info("{}", lambda: safe_log_content(content, "Content value"))
+        logger.opt(lazy=True).debug(
+            "Response object attributes: {}", lambda: vars(response) if hasattr(response, "__dict__") else dir(response)
+        )
 
         result = self._build_response(model, str(content))
         logger.info(f"<<< acompletion() FINISHED - model={model}")
@@ -467,26 +651,21 @@ class AgnoCustomLLM(CustomLLM):
         """
         logger.info("=" * 80)
         logger.info(f">>> astreaming() STARTED - model={model}")
-        logger.info(f"kwargs: {kwargs}")
-        logger.info(f"messages: {messages}")
-
-        logger.info("Extracting request parameters...")
-        # Extract request parameters first (need user_id for agent cache)
-        user_message, session_id, user_id = self._extract_request_params(messages, kwargs)
-        logger.info(f"Extracted: user_message_length={len(user_message)}, session_id={session_id}, user_id={user_id}")
+        logger.debug("kwargs: {}", kwargs)
+        logger.debug("messages: {}", messages)
 
-        logger.info("Getting agent instance...")
-        # Get agent instance (with caching based on user_id and session_id)
-        agent = self._get_agent(model, user_id=user_id, session_id=session_id, **kwargs)
+        agent, user_message, session_id, user_id = self._prepare_request(model, messages, kwargs)
 
         logger.info(f"Starting async streaming with session_id={session_id}, user_id={user_id}")
 
-        # Agent.arun() yields GenericStreamingChunk dicts directly
-        # Just pass them through to LiteLLM
+        # Agent.arun() yields GenericStreamingChunk dicts directly. Pass them
+        # through to LiteLLM, merging text chunks that arrive faster than
+        # they are consumed.
         chunk_count = 0
-        async for chunk_dict in agent.arun(user_message, stream=True, session_id=session_id, user_id=user_id):
+        stream = agent.arun(user_message, stream=True, session_id=session_id, user_id=user_id)
+        async for chunk_dict in _coalesce_text_chunks(stream):
             chunk_count += 1
-            logger.debug(f"[custom_handler] Passing through chunk #{chunk_count} to LiteLLM")
+            logger.debug("[custom_handler] Passing through chunk #{} to LiteLLM", chunk_count)
             yield chunk_dict
 
         logger.info(f"Stream completed, total chunks: {chunk_count}")
@@ -502,19 +681,20 @@ class AgnoCustomLLM(CustomLLM):
         Returns:
             User message content
         """
-        logger.debug(f"_extract_user_message() called with {len(messages)} messages")
+        logger.debug("_extract_user_message() called with {} messages", len(messages))
 
         # Find the last user message
-        for idx, message in enumerate(reversed(messages)):
+        for position in range(len(messages) - 1, -1, -1):
+            message = messages[position]
             if message.get("role") == "user":
-                content = message.get("content", "")
-                logger.debug(f"Found user message at position {len(messages) - idx - 1} (length={len(content)})")
+                content = message.get("content") or ""
+                logger.debug("Found user message at position {} (length={})", position, len(content))
                 return content
 
-        # If no user message found, concatenate all messages
+        # If no user message found, concatenate all non-empty text contents
         logger.warning("No user message found, concatenating all messages")
-        combined = " ".join(msg.get("content", "") for msg in messages)
-        logger.debug(f"Combined message length: {len(combined)}")
+        combined = " ".join(content for content in (msg.get("content") for msg in messages) if isinstance(content, str) and content)
+        logger.debug("Combined message length: {}", len(combined))
         return combined
 
     # Note: _add_messages_to_agent() method removed
@@ -532,9 +712,14 @@ agno_handler = AgnoCustomLLM()
 def register_agno_provider():
     """Register the Agno provider with LiteLLM.
 
-    Call this before using the proxy or making completion calls.
+    Call this before using the proxy or making completion calls. Calling it
+    again is a no-op, and providers registered by others are kept.
     """
-    litellm.custom_provider_map = [{"provider": "agno", "custom_handler": agno_handler}]
+    provider_map = litellm.custom_provider_map or []
+    if any(provider.get("provider") == "agno" for provider in provider_map):
+        return
+
+    litellm.custom_provider_map = [*provider_map, {"provider": "agno", "custom_handler": agno_handler}]
     print("✅ Registered Agno provider with LiteLLM")
 
 
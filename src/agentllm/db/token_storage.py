@@ -5,6 +5,9 @@ allowing per-user credential management.
 """
 
 import json
+import threading
+import time
+from collections import OrderedDict
 from datetime import datetime
 from pathlib import Path
 from typing import TYPE_CHECKING, Any
@@ -28,6 +31,17 @@ if TYPE_CHECKING:
 
 Base = declarative_base()
 
+# How long a GitHub token record read from the database is reused, and how
+# many are kept. Writes through this storage invalidate the cached record at
+# once; the TTL bounds staleness from writes made by other processes.
+_GITHUB_TOKEN_CACHE_TTL_SECS = 300.0
+_GITHUB_TOKEN_CACHE_MAX_SIZE = 1024
+
+# How long a GitHub token miss is remembered, and how many misses are kept.
+# Users who never configure GitHub would otherwise hit the database on every turn.
+_GITHUB_MISSING_TOKEN_TTL_SECS = 60.0
+_GITHUB_MISSING_TOKEN_MAX_SIZE = 10_000
+
 
 class JiraToken(Base):
     """Table for storing Jira API tokens."""
@@ -141,6 +155,15 @@ class TokenStorage:
         # Create scoped session
         self.Session = scoped_session(sessionmaker(bind=self.db_engine))
 
+        # GitHub token records read from the database and users with no record,
+        # shared by every config using this storage, with the monotonic time the
+        # entry expires, oldest first. The version is bumped by every GitHub token
+        # write, so a read racing with a write never caches what the write replaced.
+        self._github_token_cache: OrderedDict[str, tuple[dict[str, Any], float]] = OrderedDict()
+        self._github_missing_tokens: OrderedDict[str, float] = OrderedDict()
+        self._github_token_version = 0
+        self._github_token_lock = threading.Lock()
+
         # Create tables
         self._create_tables()
 
@@ -474,36 +497,67 @@ class TokenStorage:
         except Exception as e:
             logger.error(f"Error upserting GitHub token for user {user_id}: {e}")
             return False
+        finally:
+            self._invalidate_github_token(user_id)
 
     def get_github_token(self, user_id: str) -> dict[str, Any] | None:
         """Retrieve GitHub token for a user.
 
+        Records are reused for _GITHUB_TOKEN_CACHE_TTL_SECS, and at most
+        _GITHUB_TOKEN_CACHE_MAX_SIZE are kept (oldest evicted first). Misses are
+        remembered for _GITHUB_MISSING_TOKEN_TTL_SECS, up to _GITHUB_MISSING_TOKEN_MAX_SIZE.
+
         Args:
             user_id: Unique user identifier
 
         Returns:
             Dictionary with token data, or None if not found
         """
+        now = time.monotonic()
+        with self._github_token_lock:
+            cached = self._github_token_cache.get(user_id)
+            if cached is not None and now < cached[1]:
+                return dict(cached[0])
+            missing_until = self._github_missing_tokens.get(user_id)
+            if missing_until is not None and now < missing_until:
+                return None
+            version = self._github_token_version
+
         try:
             with self.Session() as sess:
                 token_record = sess.query(GitHubToken).filter_by(user_id=user_id).first()
 
-                if token_record:
-                    return {
-                        "user_id": token_record.user_id,
-                        "token": token_record.token,
-                        "server_url": token_record.server_url,
-                        "username": token_record.username,
-                        "created_at": token_record.created_at,
-                        "updated_at": token_record.updated_at,
-                    }
-
-                return None
+                if not token_record:
+                    with self._github_token_lock:
+                        if version == self._github_token_version:
+                            self._github_missing_tokens[user_id] = now + _GITHUB_MISSING_TOKEN_TTL_SECS
+                            self._github_missing_tokens.move_to_end(user_id)
+                            if len(self._github_missing_tokens) > _GITHUB_MISSING_TOKEN_MAX_SIZE:
+                                self._github_missing_tokens.popitem(last=False)
+                    return None
+
+                token_data = {
+                    "user_id": token_record.user_id,
+                    "token": token_record.token,
+                    "server_url": token_record.server_url,
+                    "username": token_record.username,
+                    "created_at": token_record.created_at,
+                    "updated_at": token_record.updated_at,
+                }
 
         except Exception as e:
             logger.error(f"Error retrieving GitHub token for user {user_id}: {e}")
             return None
 
+        with self._github_token_lock:
+            if version == self._github_token_version:
+                self._github_missing_tokens.pop(user_id, None)
+                self._github_token_cache[user_id] = (token_data, now + _GITHUB_TOKEN_CACHE_TTL_SECS)
+                self._github_token_cache.move_to_end(user_id)
+                if len(self._github_token_cache) > _GITHUB_TOKEN_CACHE_MAX_SIZE:
+                    self._github_token_cache.popitem(last=False)
+        return dict(token_data)
+
     def delete_github_token(self, user_id: str) -> bool:
         """Delete GitHub token for a user.
 
@@ -529,6 +583,19 @@ class TokenStorage:
         except Exception as e:
             logger.error(f"Error deleting GitHub token for user {user_id}: {e}")
             return False
+        finally:
+            self._invalidate_github_token(user_id)
+
+    def _invalidate_github_token(self, user_id: str) -> None:
+        """Drop a user's cached GitHub token record or miss after a write.
+
+        Args:
+            user_id: Unique user identifier
+        """
+        with self._github_token_lock:
+            self._github_token_cache.pop(user_id, None)
+            self._github_missing_tokens.pop(user_id, None)
+            self._github_token_version += 1
 
     # RHCP Token Operations
 
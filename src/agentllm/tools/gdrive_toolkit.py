@@ -23,16 +23,18 @@ class GoogleDriveTools(Toolkit):
     def __init__(
         self,
         credentials: Credentials,
+        service: Any | None = None,
         **kwargs,
     ):
         """Initialize Google Drive toolkit with OAuth credentials.
 
         Args:
             credentials: Google OAuth2 credentials
+            service: Optional pre-built Drive v3 service for these credentials
             **kwargs: Additional arguments passed to parent Toolkit
         """
         # Create exporter with pre-authenticated credentials (no file storage needed)
-        self.exporter = GoogleDriveExporter(credentials=credentials)
+        self.exporter = GoogleDriveExporter(credentials=credentials, service=service)
 
         tools: list[Any] = [
             self.get_document_content,
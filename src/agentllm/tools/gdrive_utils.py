@@ -160,6 +160,7 @@ class GoogleDriveExporter:
         config: GoogleDriveExporterConfig | None = None,
         download_callback=None,
         credentials: Credentials | None = None,
+        service: Any | None = None,
     ):
         """Initialize the exporter with configuration.
 
@@ -168,9 +169,10 @@ class GoogleDriveExporter:
             download_callback: Optional callback function called when files are downloaded.
                              Should accept (document_id, format_key, output_path, success) arguments.
             credentials: Optional pre-authenticated credentials. If provided, skips file-based auth.
+            service: Optional pre-built Drive v3 service to reuse instead of building one.
         """
         self.config = config or GoogleDriveExporterConfig()
-        self._service = None
+        self._service = service
         self._processed_docs: set[str] = set()
         self.download_callback = download_callback
         self._credentials = credentials  # Store pre-authenticated credentials
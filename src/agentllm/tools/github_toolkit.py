@@ -11,6 +11,14 @@ from agno.tools import Toolkit
 from loguru import logger
 
 
+def _auth_headers(token: str) -> dict[str, str]:
+    """Build the headers for authenticated GitHub API requests."""
+    return {
+        "Authorization": f"token {token}",
+        "Accept": "application/vnd.github.v3+json",
+    }
+
+
 class GitHubToolkit(Toolkit):
     """Toolkit for GitHub PR review prioritization and management.
 
@@ -38,10 +46,11 @@ class GitHubToolkit(Toolkit):
         self._server_url = server_url
 
         # Setup headers for GitHub API requests
-        self._headers = {
-            "Authorization": f"token {self._token}",
-            "Accept": "application/vnd.github.v3+json",
-        }
+        self._headers = _auth_headers(self._token)
+
+        # Reuse connections across API calls (list_prs fetches each PR's details)
+        self._session = requests.Session()
+        self._session.headers.update(self._headers)
 
         # Define review-specific tools
         tools = [
@@ -56,14 +65,35 @@ class GitHubToolkit(Toolkit):
     def validate_connection(self) -> tuple[bool, str]:
         """Validate the GitHub connection by authenticating.
 
+        Returns:
+            Tuple of (success: bool, message: str)
+        """
+        return self.validate_token(self._token, self._server_url, session=self._session)
+
+    @staticmethod
+    def validate_token(
+        token: str,
+        server_url: str = "https://api.github.com",
+        session: requests.Session | None = None,
+    ) -> tuple[bool, str]:
+        """Validate a GitHub token by authenticating, without building a toolkit.
+
+        Args:
+            token: GitHub personal access token
+            server_url: GitHub API server URL (default: https://api.github.com)
+            session: Session already carrying the token's headers, if any
+
         Returns:
             Tuple of (success: bool, message: str)
         """
         try:
-            logger.debug(f"Validating GitHub connection to {self._server_url}")
+            logger.debug(f"Validating GitHub connection to {server_url}")
 
             # Try to get authenticated user info
-            response = requests.get(f"{self._server_url}/user", headers=self._headers, timeout=10)
+            if session is not None:
+                response = session.get(f"{server_url}/user", timeout=10)
+            else:
+                response = requests.get(f"{server_url}/user", headers=_auth_headers(token), timeout=10)
 
             if response.status_code == 200:
                 user_data = response.json()
@@ -106,7 +136,7 @@ class GitHubToolkit(Toolkit):
             # Fetch PRs using GitHub API
             url = f"{self._server_url}/repos/{owner}/{repo_name}/pulls"
             params = {"state": state, "per_page": min(limit, 100)}
-            response = requests.get(url, headers=self._headers, params=params, timeout=30)
+            response = self._session.get(url, params=params, timeout=30)
 
             if response.status_code != 200:
                 error_msg = f"GitHub API error: {response.status_code} {response.text}"
@@ -126,7 +156,7 @@ class GitHubToolkit(Toolkit):
             for pr in pr_list[:limit]:  # Only fetch details for PRs we'll show
                 pr_number = pr.get("number")
                 detail_url = f"{self._server_url}/repos/{owner}/{repo_name}/pulls/{pr_number}"
-                detail_response = requests.get(detail_url, headers=self._headers, timeout=10)
+                detail_response = self._session.get(detail_url, timeout=10)
 
                 if detail_response.status_code == 200:
                     detailed_prs.append(detail_response.json())
@@ -224,7 +254,7 @@ class GitHubToolkit(Toolkit):
             # Fetch PRs using GitHub API
             url = f"{self._server_url}/repos/{owner}/{repo_name}/pulls"
             params = {"state": state, "per_page": 100}
-            response = requests.get(url, headers=self._headers, params=params, timeout=30)
+            response = self._session.get(url, params=params, timeout=30)
 
             if response.status_code != 200:
                 error_msg = f"GitHub API error: {response.status_code} {response.text}"
@@ -353,7 +383,7 @@ class GitHubToolkit(Toolkit):
 
             # Get PR details using GitHub API
             url = f"{self._server_url}/repos/{owner}/{repo_name}/pulls/{pr_number}"
-            response = requests.get(url, headers=self._headers, timeout=30)
+            response = self._session.get(url, timeout=30)
 
             if response.status_code != 200:
                 error_msg = f"GitHub API error: {response.status_code} {response.text}"
@@ -364,7 +394,7 @@ class GitHubToolkit(Toolkit):
 
             # Get file changes
             files_url = f"{self._server_url}/repos/{owner}/{repo_name}/pulls/{pr_number}/files"
-            files_response = requests.get(files_url, headers=self._headers, timeout=30)
+            files_response = self._session.get(files_url, timeout=30)
             changes = files_response.json() if files_response.status_code == 200 else []
 
             # Calculate score
@@ -481,7 +511,7 @@ class GitHubToolkit(Toolkit):
             # Get closed/merged PRs using GitHub API
             url = f"{self._server_url}/repos/{owner}/{repo_name}/pulls"
             params = {"state": "closed", "per_page": 100, "sort": "updated", "direction": "desc"}
-            response = requests.get(url, headers=self._headers, params=params, timeout=30)
+            response = self._session.get(url, params=params, timeout=30)
 
             if response.status_code != 200:
                 error_msg = f"GitHub API error: {response.status_code} {response.text}"
@@ -1,8 +1,21 @@
 """Tests for the Custom LiteLLM handler."""
 
+import asyncio
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
 import pytest
 
-from agentllm.custom_handler import AgnoCustomLLM, register_agno_provider
+from agentllm.custom_handler import AgnoCustomLLM, _coalesce_text_chunks, register_agno_provider
+
+
+def _text_chunk(text: str) -> dict:
+    """Build a GenericStreamingChunk carrying only text."""
+    return {"text": text, "finish_reason": None, "index": 0, "is_finished": False, "tool_use": None}
+
+
+FINAL_CHUNK = {"text": "", "finish_reason": "stop", "index": 0, "is_finished": True, "tool_use": None}
 
 
 class TestAgnoCustomLLM:
@@ -86,6 +99,19 @@ class TestAgnoCustomLLM:
         assert len(litellm.custom_provider_map) > 0
         assert any(p.get("provider") == "agno" for p in litellm.custom_provider_map)
 
+    def test_register_provider_is_idempotent(self, monkeypatch):
+        """Test that registering twice adds agno once and keeps other providers."""
+        import litellm
+
+        other = {"provider": "other", "custom_handler": object()}
+        monkeypatch.setattr(litellm, "custom_provider_map", [other])
+
+        register_agno_provider()
+        register_agno_provider()
+
+        assert [p["provider"] for p in litellm.custom_provider_map] == ["other", "agno"]
+        assert litellm.custom_provider_map[0] is other
+
     def test_model_response_structure(self):
         """Test that ModelResponse has correct structure."""
         handler = AgnoCustomLLM()
@@ -110,3 +136,255 @@ class TestAgnoCustomLLM:
         assert "prompt_tokens" in response.usage
         assert "completion_tokens" in response.usage
         assert "total_tokens" in response.usage
+
+
+class TestAgentCache:
+    """Tests for the agent cache in _get_agent()."""
+
+    @patch("agentllm.custom_handler._AGENT_CACHE_MAX_SIZE", 2)
+    @patch("agentllm.custom_handler.agent_registry")
+    def test_evicts_least_recently_used_agent(self, mock_registry):
+        """Test that the least recently used agent is dropped once the cache is full."""
+        mock_registry.get_factory.return_value.create_agent.side_effect = lambda **kwargs: MagicMock()
+        handler = AgnoCustomLLM()
+
+        agent1 = handler._get_agent("agno/demo-agent", "user1")
+        handler._get_agent("agno/demo-agent", "user2")
+        assert handler._get_agent("agno/demo-agent", "user1") is agent1
+        handler._get_agent("agno/demo-agent", "user3")
+
+        assert [key[3] for key in handler._agent_cache] == ["user1", "user3"]
+        assert handler._get_agent("agno/demo-agent", "user1") is agent1
+
+    @patch("agentllm.custom_handler.agent_registry")
+    def test_concurrent_misses_create_agent_once(self, mock_registry):
+        """Test that threads missing on the same key share one new agent."""
+
+        def create_agent(**kwargs):
+            time.sleep(0.05)
+            return MagicMock()
+
+        factory = mock_registry.get_factory.return_value
+        factory.create_agent.side_effect = create_agent
+        handler = AgnoCustomLLM()
+        agents = []
+
+        threads = [threading.Thread(target=lambda: agents.append(handler._get_agent("agno/demo-agent", "user1"))) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        factory.create_agent.assert_called_once()
+        assert len({id(agent) for agent in agents}) == 1
+        assert handler._agent_key_locks == {}
+
+    @patch("agentllm.custom_handler.agent_registry")
+    def test_slow_creation_does_not_block_other_keys(self, mock_registry):
+        """Test that a miss for one key is served while another key's agent is being created."""
+        released = threading.Event()
+
+        def create_agent(user_id, **kwargs):
+            if user_id == "slow-user":
+                released.wait(timeout=5)
+            return MagicMock()
+
+        mock_registry.get_factory.return_value.create_agent.side_effect = create_agent
+        handler = AgnoCustomLLM()
+
+        slow = threading.Thread(target=handler._get_agent, args=("agno/demo-agent", "slow-user"))
+        slow.start()
+        try:
+            assert handler._get_agent("agno/demo-agent", "user1") is not None
+            assert slow.is_alive()
+        finally:
+            released.set()
+            slow.join()
+
+    @patch("agentllm.custom_handler.agent_registry")
+    def test_failed_creation_is_not_retried_concurrently(self, mock_registry):
+        """Test that after a failed creation, waiting and new requests still build the agent one at a time."""
+        active = []
+        overlapped = []
+
+        def create_agent(**kwargs):
+            active.append(1)
+            overlapped.append(len(active) > 1)
+            time.sleep(0.05)
+            active.pop()
+            if len(overlapped) == 1:
+                raise RuntimeError("first creation fails")
+            return MagicMock()
+
+        mock_registry.get_factory.return_value.create_agent.side_effect = create_agent
+        handler = AgnoCustomLLM()
+
+        def get_agent():
+            try:
+                handler._get_agent("agno/demo-agent", "user1")
+            except RuntimeError:
+                pass
+
+        threads = [threading.Thread(target=get_agent) for _ in range(2)]
+        for thread in threads:
+            thread.start()
+        time.sleep(0.07)
+        get_agent()
+        for thread in threads:
+            thread.join()
+
+        assert overlapped == [False, False]
+        assert handler._agent_key_locks == {}
+        assert handler._agent_key_waiters == {}
+
+
+class TestSyncStreaming:
+    """Tests for streaming()."""
+
+    @patch("agentllm.custom_handler.agent_registry")
+    def test_yields_single_final_chunk(self, mock_registry):
+        """Test that sync streaming runs the agent through its sync API and yields its whole reply."""
+        agent = mock_registry.get_factory.return_value.create_agent.return_value
+        agent.run.return_value.content = "Hello there"
+
+        stream = AgnoCustomLLM().streaming(model="agno/demo-agent", messages=[{"role": "user", "content": "Hi"}], stream=True)
+        chunks = [next(stream), *stream]
+
+        assert [chunk["text"] for chunk in chunks] == ["Hello there"]
+        assert chunks[0]["is_finished"] is True
+        agent.run.assert_called_once_with("Hi", stream=False, session_id=None, user_id=None)
+
+
+class TestExtractUserMessage:
+    """Tests for _extract_user_message()."""
+
+    def test_returns_last_user_message(self):
+        """Test that the most recent user message is picked."""
+        messages = [
+            {"role": "user", "content": "first"},
+            {"role": "assistant", "content": "reply"},
+            {"role": "user", "content": "second"},
+            {"role": "assistant", "content": "another reply"},
+        ]
+
+        assert AgnoCustomLLM()._extract_user_message(messages) == "second"
+
+    def test_concatenates_text_without_user_message(self):
+        """Test the fallback skips empty and non-text contents."""
+        messages = [
+            {"role": "system", "content": "be brief"},
+            {"role": "assistant", "content": None},
+            {"role": "tool", "content": ""},
+            {"role": "assistant", "content": "done"},
+        ]
+
+        assert AgnoCustomLLM()._extract_user_message(messages) == "be brief done"
+
+
+class TestExtractSessionInfo:
+    """Tests for _extract_session_info()."""
+
+    def test_body_metadata_takes_priority(self):
+        """Test that body metadata wins over headers and LiteLLM metadata."""
+        kwargs = {
+            "litellm_params": {
+                "proxy_server_request": {"body": {"metadata": {"chat_id": "body-chat", "user_id": "body-user"}}},
+                "metadata": {"headers": {"x-openwebui-chat-id": "header-chat"}, "session_id": "meta-session"},
+            },
+            "user": "request-user",
+        }
+
+        assert AgnoCustomLLM()._extract_session_info(kwargs) == ("body-chat", "body-user")
+
+    def test_headers_match_any_case(self):
+        """Test that OpenWebUI headers are found whatever their casing."""
+        headers = {"X-OpenWebUI-Chat-Id": "header-chat", "X-OPENWEBUI-USER-EMAIL": "jdoe@example.com"}
+        kwargs = {"litellm_params": {"metadata": {"headers": headers}}}
+
+        assert AgnoCustomLLM()._extract_session_info(kwargs) == ("header-chat", "jdoe@example.com")
+
+    def test_falls_back_to_litellm_metadata_and_user_field(self):
+        """Test the last-resort sources when there is no body metadata or headers."""
+        kwargs = {"litellm_params": {"metadata": {"conversation_id": "conv-1"}}, "user": "request-user"}
+
+        assert AgnoCustomLLM()._extract_session_info(kwargs) == ("conv-1", "request-user")
+
+
+class TestCoalesceTextChunks:
+    """Tests for _coalesce_text_chunks()."""
+
+    @staticmethod
+    async def _collect(stream) -> list[dict]:
+        """Consume a coalesced stream into a list."""
+        return [chunk async for chunk in _coalesce_text_chunks(stream)]
+
+    @pytest.mark.asyncio
+    async def test_merges_waiting_text_chunks(self):
+        """Test that text chunks produced before the consumer reads them are merged."""
+
+        async def stream():
+            for text in ("Hel", "lo", "!"):
+                yield _text_chunk(text)
+            yield FINAL_CHUNK
+
+        chunks = await self._collect(stream())
+
+        assert [chunk["text"] for chunk in chunks] == ["Hello!", ""]
+        assert chunks[-1] == FINAL_CHUNK
+
+    @pytest.mark.asyncio
+    async def test_keeps_order_around_other_chunks(self):
+        """Test that non-text chunks are passed through in order, between merged text."""
+        tool_chunk = {**_text_chunk(""), "tool_use": {"name": "tool"}}
+
+        async def stream():
+            yield _text_chunk("a")
+            yield _text_chunk("b")
+            yield tool_chunk
+            await asyncio.sleep(0)
+            yield _text_chunk("c")
+            yield FINAL_CHUNK
+
+        chunks = await self._collect(stream())
+
+        assert chunks == [_text_chunk("ab"), tool_chunk, _text_chunk("c"), FINAL_CHUNK]
+
+    @pytest.mark.asyncio
+    async def test_propagates_stream_errors(self):
+        """Test that an error in the agent stream reaches the consumer after earlier chunks."""
+
+        async def stream():
+            yield _text_chunk("partial")
+            raise RuntimeError("boom")
+
+        received = []
+        with pytest.raises(RuntimeError, match="boom"):
+            async for chunk in _coalesce_text_chunks(stream()):
+                received.append(chunk)
+        assert received == [_text_chunk("partial")]
+
+    @pytest.mark.asyncio
+    async def test_reads_a_bounded_number_of_chunks_ahead(self):
+        """Test that the agent stream isn't read further while the consumer is behind."""
+        produced = 0
+
+        async def stream():
+            nonlocal produced
+            for _ in range(10):
+                produced += 1
+                yield _text_chunk("x")
+                await asyncio.sleep(0)
+            yield FINAL_CHUNK
+
+        with patch("agentllm.custom_handler._COALESCE_MAX_BUFFERED_CHUNKS", 3):
+            coalesced = _coalesce_text_chunks(stream())
+            first = await anext(coalesced)
+            for _ in range(20):
+                await asyncio.sleep(0)
+            # Chunks handed to the consumer, plus a full queue and one waiting to be queued
+            assert produced <= len(first["text"]) + 3 + 1
+
+            rest = [chunk async for chunk in coalesced]
+
+        assert "".join(chunk["text"] for chunk in [first, *rest]) == "x" * 10
+        assert rest[-1] == FINAL_CHUNK
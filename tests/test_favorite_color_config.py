@@ -0,0 +1,97 @@
+"""Tests for FavoriteColorConfig."""
+
+from unittest.mock import MagicMock
+
+import pytest
+
+from agentllm.agents.toolkit_configs.favorite_color_config import FavoriteColorConfig
+
+
+@pytest.fixture
+def config() -> FavoriteColorConfig:
+    """Provide a FavoriteColorConfig backed by a mock token storage."""
+    return FavoriteColorConfig(token_storage=MagicMock())
+
+
+class TestExtractColorFromMessage:
+    """Tests for _extract_color_from_message()."""
+
+    @pytest.mark.parametrize(
+        "message,expected",
+        [
+            ("My favorite color is Blue", "blue"),
+            ("favorite color: red", "red"),
+            ("I like green", "green"),
+            ("I prefer purple", "purple"),
+            ("set color to yellow", "yellow"),
+            ("configure color orange", "orange"),
+            ("color = pink", "pink"),
+            ("hello there", None),
+        ],
+    )
+    def test_patterns(self, config: FavoriteColorConfig, message: str, expected: str | None):
+        """Test that each supported phrasing is recognized."""
+        assert config._extract_color_from_message(message) == expected
+
+    def test_pattern_priority_is_preserved(self, config: FavoriteColorConfig):
+        """Test that an earlier pattern wins even if a later one appears first in the message."""
+        message = "I like it a lot, but my favorite color is brown"
+        assert config._extract_color_from_message(message) == "brown"
+
+    def test_matches_across_lines(self, config: FavoriteColorConfig):
+        """Test that a pattern is found after a newline."""
+        assert config._extract_color_from_message("Hi!\nset color to white") == "white"
+
+
+class TestCheckAuthorizationRequest:
+    """Tests for check_authorization_request()."""
+
+    def test_detects_reconfiguration_request(self, config: FavoriteColorConfig):
+        """Test that asking to change the color returns the config prompt."""
+        config.token_storage.get_favorite_color.return_value = None
+        prompt = config.check_authorization_request("Can I CHANGE my favorite color?", "user1")
+        assert prompt is not None
+        assert "favorite color" in prompt.lower()
+
+    def test_ignores_unrelated_message(self, config: FavoriteColorConfig):
+        """Test that unrelated messages are not treated as reconfiguration requests."""
+        assert config.check_authorization_request("What's the weather like?", "user1") is None
+
+
+class TestLoadStatus:
+    """Tests for the single-query status lookup."""
+
+    def test_get_agent_instructions_queries_once(self, config: FavoriteColorConfig):
+        """Test that instructions are built from a single storage lookup."""
+        config.token_storage.get_favorite_color.return_value = "blue"
+        instructions = config.get_agent_instructions("user1")
+        assert any("blue" in line for line in instructions)
+        config.token_storage.get_favorite_color.assert_called_once_with("user1")
+
+    def test_get_toolkit_not_configured(self, config: FavoriteColorConfig):
+        """Test that no toolkit is returned when no color is stored."""
+        config.token_storage.get_favorite_color.return_value = None
+        assert config.get_toolkit("user1") is None
+        config.token_storage.get_favorite_color.assert_called_once_with("user1")
+
+    def test_no_token_storage(self):
+        """Test that a config without storage reports not configured."""
+        config = FavoriteColorConfig()
+        assert config._load_status("user1") == (False, None)
+        assert config.is_configured("user1") is False
+
+    def test_get_toolkit_configured(self, config: FavoriteColorConfig):
+        """Test that a ColorTools toolkit is built for a configured user."""
+        from agentllm.tools.color_toolkit import ColorTools
+
+        config.token_storage.get_favorite_color.return_value = "green"
+        toolkit = config.get_toolkit("user1")
+        assert isinstance(toolkit, ColorTools)
+        assert toolkit.favorite_color == "green"
+
+    def test_get_agent_instructions_for_unlisted_color(self, config: FavoriteColorConfig):
+        """Test that a stored color outside VALID_COLORS still produces instructions."""
+        config.token_storage.get_favorite_color.return_value = "teal"
+        instructions = config.get_agent_instructions("user1")
+        assert instructions[0] == "The user's favorite color is teal."
+        assert len(instructions) == 3
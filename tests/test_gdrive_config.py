@@ -0,0 +1,369 @@
+"""Tests for GoogleDriveConfig."""
+
+from datetime import UTC, datetime, timedelta
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from agentllm.agents.toolkit_configs.gdrive_config import GoogleDriveConfig
+
+
+@pytest.fixture
+def config() -> GoogleDriveConfig:
+    """Provide a GoogleDriveConfig without token storage."""
+    return GoogleDriveConfig()
+
+
+class TestExtractGdriveCode:
+    """Tests for _extract_gdrive_code()."""
+
+    @pytest.mark.parametrize(
+        "message,expected",
+        [
+            ("http://localhost/?code=4/0AeaYSHB-abc&scope=drive", "4/0AeaYSHB-abc"),
+            ("CODE=4/xyz", "4/xyz"),
+            ("my google drive code is 4/abc123", "4/abc123"),
+            ("gdrive auth code: 4/abc123", "4/abc123"),
+            ("set drive code to 4/abc123", "4/abc123"),
+            ("4/0AeaYSHB_x.y-z", "4/0AeaYSHB_x.y-z"),
+            ("here it is 4/abc123 thanks", "4/abc123"),
+            ("hello, can you read my docs?", None),
+            ("the ratio is 14/3", None),
+        ],
+    )
+    def test_extraction(self, config: GoogleDriveConfig, message: str, expected: str | None):
+        """Test that authorization codes are extracted from supported formats."""
+        assert config._extract_gdrive_code(message) == expected
+
+    def test_url_code_without_google_prefix_is_ignored(self, config: GoogleDriveConfig):
+        """Test that a non-Google code parameter is not treated as an auth code."""
+        assert config._extract_gdrive_code("https://example.com/?code=abc") is None
+
+
+class TestCheckAuthorizationRequest:
+    """Tests for check_authorization_request()."""
+
+    @pytest.fixture(autouse=True)
+    def _no_oauth_client(self, monkeypatch):
+        monkeypatch.delenv("GDRIVE_CLIENT_ID", raising=False)
+        monkeypatch.delenv("GDRIVE_CLIENT_SECRET", raising=False)
+
+    @pytest.mark.parametrize(
+        "message",
+        [
+            "Can you read my Google Drive folder?",
+            "open this GDRIVE file",
+            "Summarize https://docs.google.com/document/d/abc and the google doc",
+            "see https://drive.google.com/file/d/abc",
+        ],
+    )
+    def test_detects_gdrive_mention(self, message: str):
+        """Test that Google Drive mentions trigger the authorization flow."""
+        config = GoogleDriveConfig()
+        prompt = config.check_authorization_request(message, "user1")
+        assert prompt is not None
+        assert "GDRIVE_CLIENT_ID" in prompt
+
+    def test_ignores_unrelated_message(self):
+        """Test that messages not mentioning Google Drive are ignored."""
+        config = GoogleDriveConfig()
+        assert config.check_authorization_request("Drive me to the airport", "user1") is None
+
+
+class TestOAuthUrl:
+    """Tests for OAuth URL generation."""
+
+    def test_generates_url_from_client_config(self, monkeypatch):
+        """Test that the OAuth URL carries the client id and user state."""
+        monkeypatch.setenv("GDRIVE_CLIENT_ID", "client-123")
+        monkeypatch.setenv("GDRIVE_CLIENT_SECRET", "secret-456")
+        config = GoogleDriveConfig()
+
+        url = config._generate_gdrive_oauth_url("user1")
+
+        assert url.startswith("https://accounts.google.com/o/oauth2/auth")
+        assert "client_id=client-123" in url
+        assert "state=user1" in url
+
+    def test_raises_without_client_config(self, monkeypatch):
+        """Test that URL generation fails when OAuth is not configured."""
+        monkeypatch.delenv("GDRIVE_CLIENT_ID", raising=False)
+        monkeypatch.delenv("GDRIVE_CLIENT_SECRET", raising=False)
+        config = GoogleDriveConfig()
+
+        with pytest.raises(ValueError, match="GDRIVE_CLIENT_ID"):
+            config._generate_gdrive_oauth_url("user1")
+
+
+class TestCredentialRefresh:
+    """Tests for refreshing stored credentials."""
+
+    @staticmethod
+    def _creds(expires_in: timedelta) -> MagicMock:
+        creds = MagicMock()
+        creds.refresh_token = "refresh-token"
+        creds.expiry = datetime.now(UTC).replace(tzinfo=None) + expires_in
+        creds.expired = expires_in <= timedelta(0)
+        return creds
+
+    @patch("agentllm.tools.gdrive_toolkit.GoogleDriveTools")
+    def test_refreshes_in_background_when_close_to_expiry(self, mock_tools):
+        """Test that credentials near expiry are refreshed off the request path."""
+        token_storage = MagicMock()
+        creds = self._creds(timedelta(minutes=2))
+        token_storage.get_gdrive_credentials.return_value = creds
+        config = GoogleDriveConfig(token_storage=token_storage)
+
+        with patch("agentllm.agents.toolkit_configs.gdrive_config.threading.Thread") as mock_thread:
+            assert config._get_gdrive_credentials("user1") is creds
+            creds.refresh.assert_not_called()
+            mock_thread.return_value.start.assert_called_once()
+            target = mock_thread.call_args.kwargs["target"]
+            args = mock_thread.call_args.kwargs["args"]
+
+        target(*args)
+        creds.refresh.assert_called_once()
+        token_storage.upsert_gdrive_token.assert_called_once_with("user1", creds)
+        assert "user1" not in config._refreshing
+
+    @patch("agentllm.tools.gdrive_toolkit.GoogleDriveTools")
+    def test_background_refresh_does_not_overwrite_reauthorized_credentials(self, mock_tools):
+        """Test that a refresh finishing after the user re-authorized is discarded."""
+        token_storage = MagicMock()
+        creds = self._creds(timedelta(minutes=2))
+        token_storage.get_gdrive_credentials.return_value = creds
+        config = GoogleDriveConfig(token_storage=token_storage)
+
+        with patch("agentllm.agents.toolkit_configs.gdrive_config.threading.Thread") as mock_thread:
+            config._get_gdrive_credentials("user1")
+            target = mock_thread.call_args.kwargs["target"]
+            args = mock_thread.call_args.kwargs["args"]
+
+        new_creds = self._creds(timedelta(hours=1))
+        config._gdrive_creds["user1"] = (new_creds, False)
+        target(*args)
+
+        creds.refresh.assert_called_once()
+        token_storage.upsert_gdrive_token.assert_not_called()
+        assert config._gdrive_creds["user1"][0] is new_creds
+
+    @patch("agentllm.tools.gdrive_toolkit.GoogleDriveTools")
+    def test_no_second_refresh_after_background_refresh(self, mock_tools):
+        """Test that the cached expiry is updated once a background refresh completes."""
+        token_storage = MagicMock()
+        creds = self._creds(timedelta(minutes=2))
+        creds.refresh.side_effect = lambda request: setattr(creds, "expiry", datetime.now(UTC).replace(tzinfo=None) + timedelta(hours=1))
+        token_storage.get_gdrive_credentials.return_value = creds
+        config = GoogleDriveConfig(token_storage=token_storage)
+
+        with patch("agentllm.agents.toolkit_configs.gdrive_config.threading.Thread") as mock_thread:
+            config._get_gdrive_credentials("user1")
+            target = mock_thread.call_args.kwargs["target"]
+            args = mock_thread.call_args.kwargs["args"]
+            target(*args)
+
+            config._get_gdrive_credentials("user1")
+            mock_thread.assert_called_once()
+
+    @patch("agentllm.tools.gdrive_toolkit.GoogleDriveTools")
+    def test_refreshes_inline_when_expired(self, mock_tools):
+        """Test that expired credentials are still refreshed before use."""
+        token_storage = MagicMock()
+        creds = self._creds(timedelta(minutes=-1))
+        token_storage.get_gdrive_credentials.return_value = creds
+        config = GoogleDriveConfig(token_storage=token_storage)
+
+        with patch("agentllm.agents.toolkit_configs.gdrive_config.threading.Thread") as mock_thread:
+            config._get_gdrive_credentials("user1")
+            mock_thread.assert_not_called()
+
+        creds.refresh.assert_called_once()
+        token_storage.upsert_gdrive_token.assert_called_once_with("user1", creds)
+
+    @patch("agentllm.tools.gdrive_toolkit.GoogleDriveTools")
+    def test_no_refresh_when_token_is_fresh(self, mock_tools):
+        """Test that fresh credentials are used as-is."""
+        token_storage = MagicMock()
+        creds = self._creds(timedelta(hours=1))
+        token_storage.get_gdrive_credentials.return_value = creds
+        config = GoogleDriveConfig(token_storage=token_storage)
+
+        with patch("agentllm.agents.toolkit_configs.gdrive_config.threading.Thread") as mock_thread:
+            config._get_gdrive_credentials("user1")
+            mock_thread.assert_not_called()
+
+        creds.refresh.assert_not_called()
+
+    @patch("agentllm.tools.gdrive_toolkit.GoogleDriveTools")
+    def test_credentials_are_loaded_once(self, mock_tools):
+        """Test that repeated toolkit lookups reuse the cached credentials."""
+        token_storage = MagicMock()
+        creds = self._creds(timedelta(hours=1))
+        token_storage.get_gdrive_credentials.return_value = creds
+        config = GoogleDriveConfig(token_storage=token_storage)
+
+        config.get_toolkit("user1")
+        config.get_toolkit("user1")
+
+        token_storage.get_gdrive_credentials.assert_called_once_with("user1")
+        mock_tools.assert_called_once_with(credentials=creds, service=None)
+
+    @patch("agentllm.tools.gdrive_toolkit.GoogleDriveTools")
+    def test_is_configured_uses_cached_credentials(self, mock_tools):
+        """Test that is_configured doesn't query storage once credentials are loaded."""
+        token_storage = MagicMock()
+        token_storage.get_gdrive_credentials.return_value = self._creds(timedelta(hours=1))
+        config = GoogleDriveConfig(token_storage=token_storage)
+
+        config.get_toolkit("user1")
+        assert config.is_configured("user1") is True
+
+        token_storage.get_gdrive_credentials.assert_called_once_with("user1")
+
+    @patch("agentllm.tools.gdrive_toolkit.GoogleDriveTools")
+    def test_deleted_token_is_noticed_after_recheck_interval(self, mock_tools):
+        """Test that cached credentials are dropped once the stored token is gone."""
+        token_storage = MagicMock()
+        token_storage.get_gdrive_credentials.return_value = self._creds(timedelta(hours=1))
+        config = GoogleDriveConfig(token_storage=token_storage)
+
+        with patch("agentllm.agents.toolkit_configs.gdrive_config.time.monotonic", return_value=0.0):
+            config.get_toolkit("user1")
+        token_storage.get_gdrive_credentials.return_value = None
+
+        with patch("agentllm.agents.toolkit_configs.gdrive_config.time.monotonic", return_value=60.0):
+            assert config.is_configured("user1") is True
+        with patch("agentllm.agents.toolkit_configs.gdrive_config.time.monotonic", return_value=301.0):
+            assert config.is_configured("user1") is False
+
+        assert "user1" not in config._gdrive_creds
+        assert "user1" not in config._gdrive_toolkits
+
+    @patch("agentllm.tools.gdrive_toolkit.GoogleDriveTools")
+    def test_replaced_token_is_reloaded_after_recheck_interval(self, mock_tools):
+        """Test that a token replaced in storage replaces the cached credentials."""
+        token_storage = MagicMock()
+        creds = self._creds(timedelta(hours=1))
+        token_storage.get_gdrive_credentials.return_value = creds
+        config = GoogleDriveConfig(token_storage=token_storage)
+
+        with patch("agentllm.agents.toolkit_configs.gdrive_config.time.monotonic", return_value=0.0):
+            config.get_toolkit("user1")
+        new_creds = self._creds(timedelta(hours=1))
+        new_creds.refresh_token = "new-refresh-token"
+        token_storage.get_gdrive_credentials.return_value = new_creds
+
+        with patch("agentllm.agents.toolkit_configs.gdrive_config.time.monotonic", return_value=301.0):
+            assert config._get_gdrive_credentials("user1") is new_creds
+
+        mock_tools.assert_called_with(credentials=new_creds, service=None)
+
+    def test_loads_legacy_in_memory_token(self, config: GoogleDriveConfig):
+        """Test that a token stored as JSON in memory is parsed into credentials."""
+        from google.oauth2.credentials import Credentials
+
+        stored = Credentials(
+            token="access-token",
+            refresh_token="refresh-token",
+            token_uri="https://oauth2.googleapis.com/token",
+            client_id="client-id",
+            client_secret="client-secret",
+        )
+        config._user_configs["user1"] = {"gdrive_token": stored.to_json()}
+
+        creds, in_memory = config._load_gdrive_credentials("user1")
+
+        assert in_memory is True
+        assert creds.token == "access-token"
+        assert creds.refresh_token == "refresh-token"
+
+
+class TestCacheEviction:
+    """Tests for bounding the per-user credential caches."""
+
+    @patch("agentllm.tools.gdrive_toolkit.GoogleDriveTools")
+    @patch("agentllm.agents.toolkit_configs.gdrive_config._MAX_CACHED_USERS", 1)
+    def test_evicts_least_recently_used_user(self, mock_tools):
+        """Test that users beyond the cap are evicted and reloaded from storage."""
+        token_storage = MagicMock()
+        token_storage.get_gdrive_credentials.side_effect = lambda user_id: TestCredentialRefresh._creds(timedelta(hours=1))
+        config = GoogleDriveConfig(token_storage=token_storage)
+
+        config.get_toolkit("user1")
+        config.get_toolkit("user2")
+
+        assert "user1" not in config._gdrive_creds
+        assert "user1" not in config._gdrive_toolkits
+        assert "user2" in config._gdrive_creds
+
+        config.get_toolkit("user1")
+        assert token_storage.get_gdrive_credentials.call_count == 3
+
+    @patch("agentllm.tools.gdrive_toolkit.GoogleDriveTools")
+    @patch("agentllm.agents.toolkit_configs.gdrive_config._MAX_CACHED_USERS", 1)
+    def test_user_being_refreshed_is_kept_until_token_is_stored(self, mock_tools):
+        """Test that eviction doesn't lose a token refreshed in the background."""
+        token_storage = MagicMock()
+        creds = TestCredentialRefresh._creds(timedelta(minutes=2))
+        token_storage.get_gdrive_credentials.side_effect = lambda user_id: (
+            creds if user_id == "user1" else TestCredentialRefresh._creds(timedelta(hours=1))
+        )
+        config = GoogleDriveConfig(token_storage=token_storage)
+
+        with patch("agentllm.agents.toolkit_configs.gdrive_config.threading.Thread") as mock_thread:
+            config.get_toolkit("user1")
+            target = mock_thread.call_args.kwargs["target"]
+            args = mock_thread.call_args.kwargs["args"]
+        config.get_toolkit("user2")
+        assert config._gdrive_creds["user1"][0] is creds
+
+        target(*args)
+        token_storage.upsert_gdrive_token.assert_called_once_with("user1", creds)
+
+        config.get_toolkit("user2")
+        assert "user1" not in config._gdrive_creds
+
+    @patch("agentllm.tools.gdrive_toolkit.GoogleDriveTools")
+    def test_evicts_idle_users(self, mock_tools):
+        """Test that users idle past the timeout are evicted."""
+        token_storage = MagicMock()
+        token_storage.get_gdrive_credentials.return_value = TestCredentialRefresh._creds(timedelta(hours=1))
+        config = GoogleDriveConfig(token_storage=token_storage)
+
+        with patch("agentllm.agents.toolkit_configs.gdrive_config.time.monotonic", return_value=0.0):
+            config.get_toolkit("user1")
+        with patch("agentllm.agents.toolkit_configs.gdrive_config.time.monotonic", return_value=2 * 24 * 3600.0):
+            config.get_toolkit("user2")
+
+        assert list(config._gdrive_recent) == ["user2"]
+        assert "user1" not in config._gdrive_creds
+
+
+class TestExtractAndStoreConfig:
+    """Tests for extract_and_store_config()."""
+
+    @pytest.fixture(autouse=True)
+    def _oauth_client(self, monkeypatch):
+        monkeypatch.setenv("GDRIVE_CLIENT_ID", "client-123")
+        monkeypatch.setenv("GDRIVE_CLIENT_SECRET", "secret-456")
+
+    @patch("agentllm.tools.gdrive_toolkit.GoogleDriveTools")
+    @patch("googleapiclient.discovery.build")
+    @patch("google_auth_oauthlib.flow.Flow")
+    def test_validation_service_is_reused_by_toolkit(self, mock_flow, mock_build, mock_tools):
+        """Test that the Drive service built for validation is handed to the toolkit."""
+        creds = MagicMock()
+        mock_flow.from_client_config.return_value.credentials = creds
+        service = mock_build.return_value
+        service.about.return_value.get.return_value.execute.return_value = {
+            "user": {"displayName": "Test User", "emailAddress": "test@example.com"}
+        }
+        token_storage = MagicMock()
+        config = GoogleDriveConfig(token_storage=token_storage)
+
+        confirmation = config.extract_and_store_config("http://localhost?code=4/abc", "user1")
+
+        assert "Test User" in confirmation
+        mock_build.assert_called_once()
+        mock_tools.assert_called_once_with(credentials=creds, service=service)
+        token_storage.upsert_gdrive_token.assert_called_once_with("user1", creds)
@@ -1,6 +1,7 @@
 """Tests for GitHub Review Prioritization Agent."""
 
 from datetime import UTC, datetime, timedelta
+from unittest.mock import MagicMock, patch
 
 import pytest
 
@@ -294,6 +295,59 @@ class TestGitHubConfig:
         result = config.check_authorization_request("Hello, how are you?", "test_user")
         assert result is None
 
+    def test_authorization_request_ignores_words_containing_keywords(self):
+        """Test that "pr" and "repo" inside other words don't trigger the GitHub prompt."""
+        from agentllm.agents.toolkit_configs.github_config import GitHubConfig
+
+        config = GitHubConfig()
+
+        for msg in ["What's new in Spring Boot?", "Summarize the quarterly report", "Please improve this"]:
+            assert config.check_authorization_request(msg, "test_user") is None
+
+        for msg in ["List my open PRs", "Which repos need attention?", "Show the repositories"]:
+            assert "GitHub" in config.check_authorization_request(msg, "test_user")
+
+    @patch("agentllm.agents.toolkit_configs.github_config._GitHubToolkit")
+    def test_get_toolkit_reads_storage_once(self, mock_toolkit):
+        """Test that recreating a toolkit doesn't read the token twice."""
+        from agentllm.agents.toolkit_configs.github_config import GitHubConfig
+
+        token_storage = MagicMock()
+        token_storage.get_github_token.return_value = {"token": "ghp_x", "server_url": "https://ghe.example.com"}
+        config = GitHubConfig(token_storage=token_storage)
+
+        assert config.get_toolkit("user1") is mock_toolkit.return_value
+        token_storage.get_github_token.assert_called_once_with("user1")
+        mock_toolkit.assert_called_once_with(token="ghp_x", server_url="https://ghe.example.com")
+
+    @patch("agentllm.agents.toolkit_configs.github_config._GitHubToolkit")
+    def test_storing_token_does_not_read_it_back(self, mock_toolkit):
+        """Test that a successful upsert isn't followed by a verification read."""
+        from agentllm.agents.toolkit_configs.github_config import GitHubConfig
+
+        mock_toolkit.validate_token.return_value = (True, "Connected as @octocat")
+        token_storage = MagicMock()
+        token_storage.upsert_github_token.return_value = True
+        config = GitHubConfig(token_storage=token_storage)
+
+        result = config.extract_and_store_config("my github token is ghp_" + "x" * 36, "user1")
+
+        assert "GitHub configured successfully" in result
+        token_storage.upsert_github_token.assert_called_once()
+        token_storage.get_github_token.assert_not_called()
+
+    @patch("agentllm.agents.toolkit_configs.github_config._GitHubToolkit")
+    def test_invalid_token_does_not_build_toolkit(self, mock_toolkit):
+        """Test that a token failing validation is rejected before a toolkit is built."""
+        from agentllm.agents.toolkit_configs.github_config import GitHubConfig
+
+        mock_toolkit.validate_token.return_value = (False, "401 Bad credentials")
+        config = GitHubConfig(token_storage=MagicMock())
+
+        with pytest.raises(ValueError, match="Bad credentials"):
+            config.extract_and_store_config("my github token is ghp_" + "x" * 36, "user1")
+        mock_toolkit.assert_not_called()
+
 
 class TestTokenStorage:
     """Test GitHub token storage in database."""
@@ -343,6 +397,70 @@ class TestTokenStorage:
         # Verify it's gone
         assert storage.get_github_token("test_user") is None
 
+    def test_github_token_lookups_are_cached(self):
+        """Test that repeated reads reuse the record until the TTL expires."""
+        from agentllm.db import TokenStorage
+
+        storage = TokenStorage(db_url="sqlite:///:memory:")
+        storage.upsert_github_token("test_user", "ghp_test_token", "https://api.github.com")
+
+        with patch.object(storage, "Session", wraps=storage.Session) as session:
+            with patch("agentllm.db.token_storage.time.monotonic", return_value=0.0):
+                assert storage.get_github_token("test_user")["token"] == "ghp_test_token"
+                assert storage.get_github_token("test_user")["token"] == "ghp_test_token"
+            assert session.call_count == 1
+
+            with patch("agentllm.db.token_storage.time.monotonic", return_value=301.0):
+                storage.get_github_token("test_user")
+            assert session.call_count == 2
+
+    def test_github_token_writes_invalidate_cache(self):
+        """Test that writing a token invalidates the record cached for every config sharing the storage."""
+        from agentllm.agents.toolkit_configs.github_config import GitHubConfig
+        from agentllm.db import TokenStorage
+
+        storage = TokenStorage(db_url="sqlite:///:memory:")
+        storage.upsert_github_token("test_user", "ghp_old", "https://api.github.com")
+        reader = GitHubConfig(token_storage=storage)
+        assert reader._load_token_record("test_user")["token"] == "ghp_old"
+
+        storage.upsert_github_token("test_user", "ghp_new", "https://api.github.com")
+        assert reader._load_token_record("test_user")["token"] == "ghp_new"
+
+        storage.delete_github_token("test_user")
+        assert storage.get_github_token("test_user") is None
+
+    def test_missing_github_token_is_cached(self):
+        """Test that a user without a token isn't looked up again until the miss expires."""
+        from agentllm.db import TokenStorage
+
+        storage = TokenStorage(db_url="sqlite:///:memory:")
+
+        with patch.object(storage, "Session", wraps=storage.Session) as session:
+            with patch("agentllm.db.token_storage.time.monotonic", return_value=0.0):
+                assert storage.get_github_token("test_user") is None
+                assert storage.get_github_token("test_user") is None
+            assert session.call_count == 1
+
+            with patch("agentllm.db.token_storage.time.monotonic", return_value=61.0):
+                assert storage.get_github_token("test_user") is None
+            assert session.call_count == 2
+
+    def test_storing_github_token_clears_cached_miss(self):
+        """Test that a config sees a token stored through another config despite an earlier miss."""
+        from agentllm.agents.toolkit_configs.github_config import GitHubConfig
+        from agentllm.db import TokenStorage
+
+        storage = TokenStorage(db_url="sqlite:///:memory:")
+        reader = GitHubConfig(token_storage=storage)
+        assert reader.is_configured("test_user") is False
+
+        with patch("agentllm.agents.toolkit_configs.github_config._GitHubToolkit") as mock_toolkit:
+            mock_toolkit.validate_token.return_value = (True, "Connected")
+            GitHubConfig(token_storage=storage).extract_and_store_config("my github token is ghp_" + "x" * 36, "test_user")
+
+        assert reader.is_configured("test_user") is True
+
     def test_list_users_with_github_tokens(self):
         """Test listing all users with GitHub tokens."""
         from agentllm.db import TokenStorage
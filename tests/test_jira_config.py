@@ -0,0 +1,107 @@
+"""Tests for JiraConfig."""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from agentllm.agents.toolkit_configs.jira_config import JiraConfig
+
+
+@pytest.fixture
+def token_storage() -> MagicMock:
+    """Provide a mock token storage holding a Jira token for user1."""
+    token_storage = MagicMock()
+    token_storage.get_jira_token.side_effect = lambda user_id: (
+        {"token": "jira-token", "server_url": "https://jira.example.com", "username": None} if user_id == "user1" else None
+    )
+    return token_storage
+
+
+class TestGetToolkit:
+    """Tests for get_toolkit()."""
+
+    @patch("agentllm.agents.toolkit_configs.jira_config.JiraTools")
+    def test_recreates_toolkit_with_one_storage_read(self, mock_tools, token_storage):
+        """Test that recreating a toolkit reads the token once."""
+        config = JiraConfig(token_storage=token_storage)
+
+        assert config.get_toolkit("user1") is mock_tools.return_value
+        token_storage.get_jira_token.assert_called_once_with("user1")
+        assert mock_tools.call_args.kwargs["server_url"] == "https://jira.example.com"
+
+    def test_not_configured(self, token_storage):
+        """Test that no toolkit is returned for a user without a token."""
+        config = JiraConfig(token_storage=token_storage)
+
+        assert config.get_toolkit("user2") is None
+        assert config.is_configured("user2") is False
+
+    def test_storage_error_returns_none(self, token_storage):
+        """Test that a failing token lookup is logged and yields no toolkit."""
+        token_storage.get_jira_token.side_effect = RuntimeError("database is locked")
+        config = JiraConfig(token_storage=token_storage)
+
+        assert config.get_toolkit("user1") is None
+
+    @patch("agentllm.agents.toolkit_configs.jira_config.JiraTools")
+    def test_legacy_in_memory_token(self, mock_tools):
+        """Test that a toolkit is recreated from legacy in-memory storage."""
+        config = JiraConfig(jira_server="https://jira.example.com")
+        config._jira_tokens["user1"] = "jira-token"
+
+        assert config.is_configured("user1") is True
+        assert config.get_toolkit("user1") is mock_tools.return_value
+        assert mock_tools.call_args.kwargs["token"] == "jira-token"
+
+
+class TestExtractAndStoreConfig:
+    """Tests for extract_and_store_config()."""
+
+    @patch("agentllm.agents.toolkit_configs.jira_config.JiraTools")
+    def test_stores_token_in_memory_without_storage(self, mock_tools):
+        """Test that a validated token is kept in memory when there is no token storage."""
+        mock_tools.return_value.validate_connection.return_value = (True, "Connected as jdoe")
+        config = JiraConfig()
+
+        result = config.extract_and_store_config("my jira token is abc123", "user1")
+
+        assert "JIRA configured successfully" in result
+        assert config.is_configured("user1") is True
+        assert config.get_toolkit("user1") is mock_tools.return_value
+
+    @patch("agentllm.agents.toolkit_configs.jira_config.JiraTools")
+    def test_invalid_token_raises(self, mock_tools):
+        """Test that a token failing validation is rejected and not stored."""
+        mock_tools.return_value.validate_connection.return_value = (False, "401 Unauthorized")
+        config = JiraConfig()
+
+        with pytest.raises(ValueError, match="401 Unauthorized"):
+            config.extract_and_store_config("my jira token is abc123", "user1")
+        assert config.is_configured("user1") is False
+
+
+class TestExtractJiraToken:
+    """Tests for _extract_jira_token()."""
+
+    @pytest.mark.parametrize(
+        "message,expected",
+        [
+            ("my jira token is abc123", "abc123"),
+            ("set jira token to abc123", "abc123"),
+            ("jira_token: abc123", "abc123"),
+            ("a1" * 15, "a1" * 15),
+            ("here it is: " + "Ab+/=9" * 6 + " thanks", "Ab+/=9" * 6),
+            ("a" * 40, None),
+            ("1" * 40, None),
+            ("a1" * 10, None),
+            ("hello there", None),
+        ],
+    )
+    def test_patterns(self, message: str, expected: str | None):
+        """Test keyword and standalone token extraction."""
+        assert JiraConfig()._extract_jira_token(message) == expected
+
+    def test_skips_standalone_candidate_without_digits(self):
+        """Test that a long letters-only word doesn't hide a later token."""
+        token = "x9" * 16
+        assert JiraConfig()._extract_jira_token(f"{'a' * 40} {token}") == token
@@ -116,8 +116,8 @@ class TestToolkitConfiguration:
 
         # Mock Google Drive toolkit creation and validation
         mock_creds = MagicMock()
-        with patch("agentllm.agents.toolkit_configs.gdrive_config.Flow") as mock_flow:
-            with patch("agentllm.agents.toolkit_configs.gdrive_config.build") as mock_build:
+        with patch("google_auth_oauthlib.flow.Flow") as mock_flow:
+            with patch("googleapiclient.discovery.build") as mock_build:
                 # Mock OAuth flow
                 mock_flow_instance = MagicMock()
                 mock_flow_instance.credentials = mock_creds
@@ -170,8 +170,8 @@ class TestToolkitConfiguration:
 
         # Mock Google Drive OAuth flow
         mock_creds = MagicMock()
-        with patch("agentllm.agents.toolkit_configs.gdrive_config.Flow") as mock_flow:
-            with patch("agentllm.agents.toolkit_configs.gdrive_config.build") as mock_build:
+        with patch("google_auth_oauthlib.flow.Flow") as mock_flow:
+            with patch("googleapiclient.discovery.build") as mock_build:
                 # Mock token storage to avoid JSON serialization issues with MagicMock
                 with patch.object(gdrive_config.token_storage, "upsert_gdrive_token"):
                     with patch.object(
@@ -200,7 +200,7 @@ class TestToolkitConfiguration:
         agent = ReleaseManager(shared_db=shared_db, token_storage=token_storage, user_id="test-user")
 
         # Mock OAuth URL generation
-        with patch("agentllm.agents.toolkit_configs.gdrive_config.Flow") as mock_flow:
+        with patch("google_auth_oauthlib.flow.Flow") as mock_flow:
             mock_flow_instance = MagicMock()
             mock_flow_instance.authorization_url.return_value = ("http://oauth.url", "state")
             mock_flow.from_client_config.return_value = mock_flow_instance
@@ -222,8 +222,8 @@ class TestAgentExecution:
         agent = ReleaseManager(shared_db=shared_db, token_storage=token_storage, user_id="test-user")
 
         # Mock and configure Google Drive (required toolkit)
-        with patch("agentllm.agents.toolkit_configs.gdrive_config.Flow") as mock_flow:
-            with patch("agentllm.agents.toolkit_configs.gdrive_config.build") as mock_build:
+        with patch("google_auth_oauthlib.flow.Flow") as mock_flow:
+            with patch("googleapiclient.discovery.build") as mock_build:
                 mock_creds = MagicMock()
                 mock_flow_instance = MagicMock()
                 mock_flow_instance.credentials = mock_creds
@@ -294,8 +294,8 @@ class TestAgentCaching:
         manager = ReleaseManager(shared_db=shared_db, token_storage=token_storage, user_id="test-user")
 
         # Configure Google Drive for both users
-        with patch("agentllm.agents.toolkit_configs.gdrive_config.Flow") as mock_flow:
-            with patch("agentllm.agents.toolkit_configs.gdrive_config.build") as mock_build:
+        with patch("google_auth_oauthlib.flow.Flow") as mock_flow:
+            with patch("googleapiclient.discovery.build") as mock_build:
                 mock_creds = MagicMock()
                 mock_flow_instance = MagicMock()
                 mock_flow_instance.credentials = mock_creds
@@ -332,8 +332,8 @@ class TestAgentCaching:
 
         # Mock Google Drive OAuth to configure a toolkit
         mock_creds = MagicMock()
-        with patch("agentllm.agents.toolkit_configs.gdrive_config.Flow") as mock_flow:
-            with patch("agentllm.agents.toolkit_configs.gdrive_config.build") as mock_build:
+        with patch("google_auth_oauthlib.flow.Flow") as mock_flow:
+            with patch("googleapiclient.discovery.build") as mock_build:
                 mock_flow_instance = MagicMock()
                 mock_flow_instance.credentials = mock_creds
                 mock_flow.from_client_config.return_value = mock_flow_instance
@@ -364,7 +364,7 @@ class TestConfigurationValidation:
         agent = ReleaseManager(shared_db=shared_db, token_storage=token_storage, user_id="test-user")
 
         # Mock failed OAuth exchange
-        with patch("agentllm.agents.toolkit_configs.gdrive_config.Flow") as mock_flow:
+        with patch("google_auth_oauthlib.flow.Flow") as mock_flow:
             mock_flow_instance = MagicMock()
             mock_flow_instance.fetch_token.side_effect = Exception("Invalid code")
             mock_flow.from_client_config.return_value = mock_flow_instance
@@ -387,8 +387,8 @@ class TestToolkitInstructions:
 
         # Mock Google Drive OAuth
         mock_creds = MagicMock()
-        with patch("agentllm.agents.toolkit_configs.gdrive_config.Flow") as mock_flow:
-            with patch("agentllm.agents.toolkit_configs.gdrive_config.build") as mock_build:
+        with patch("google_auth_oauthlib.flow.Flow") as mock_flow:
+            with patch("googleapiclient.discovery.build") as mock_build:
                 mock_flow_instance = MagicMock()
                 mock_flow_instance.credentials = mock_creds
                 mock_flow.from_client_config.return_value = mock_flow_instance
@@ -0,0 +1,161 @@
+"""Tests for RHCPConfig."""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from agentllm.agents.toolkit_configs.rhcp_config import RHCPConfig
+
+# A JWT-looking offline token long enough to be detected on its own
+OFFLINE_TOKEN = "eyJhbGciOiJIUzI1NiIsInR5cCIgOiAiSldUIiwia2lkIiA6ICJhZD" + "x1.-_" * 20
+
+
+class TestExtractRhcpToken:
+    """Tests for _extract_rhcp_token()."""
+
+    @pytest.mark.parametrize(
+        "message,expected",
+        [
+            ("my rhcp token is abc123", "abc123"),
+            ("My RHCP offline token = abc123", "abc123"),
+            ("set rhcp token to abc123", "abc123"),
+            ("rhcp token: abc123", "abc123"),
+            ("my offline token is abc123", "abc123"),
+            (OFFLINE_TOKEN, OFFLINE_TOKEN),
+            (f"here you go:\n{OFFLINE_TOKEN}\nthanks", OFFLINE_TOKEN),
+            ("a" * 120, None),
+            (OFFLINE_TOKEN[:99], None),
+            ("what is an rhcp token?", None),
+        ],
+    )
+    def test_patterns(self, message: str, expected: str | None):
+        """Test keyword and standalone token extraction."""
+        assert RHCPConfig()._extract_rhcp_token(message) == expected
+
+    def test_long_word_does_not_hide_token(self):
+        """Test that a long non-token word before the token doesn't stop detection."""
+        message = f"{'a' * 120} {OFFLINE_TOKEN}"
+        assert RHCPConfig()._extract_rhcp_token(message) == OFFLINE_TOKEN
+
+    def test_token_must_start_a_word(self):
+        """Test that "eyJ" in the middle of a long word isn't taken as a token."""
+        assert RHCPConfig()._extract_rhcp_token(f"x{OFFLINE_TOKEN}") is None
+
+
+class TestIsConfigured:
+    """Tests for is_configured()."""
+
+    def test_positive_answer_is_cached(self):
+        """Test that a configured user isn't looked up in storage again."""
+        token_storage = MagicMock()
+        token_storage.get_rhcp_token.return_value = {"offline_token": OFFLINE_TOKEN}
+        config = RHCPConfig(token_storage=token_storage)
+
+        assert config.is_configured("user1") is True
+        assert config.is_configured("user1") is True
+        token_storage.get_rhcp_token.assert_called_once_with("user1")
+
+    def test_negative_answer_is_not_cached(self):
+        """Test that a user without a token is checked again, as they may configure one."""
+        token_storage = MagicMock()
+        token_storage.get_rhcp_token.return_value = None
+        config = RHCPConfig(token_storage=token_storage)
+
+        assert config.is_configured("user1") is False
+        token_storage.get_rhcp_token.return_value = {"offline_token": OFFLINE_TOKEN}
+        assert config.is_configured("user1") is True
+
+    @patch("agentllm.agents.toolkit_configs.rhcp_config.RHCPTools")
+    @patch("agentllm.agents.toolkit_configs.rhcp_config.time.monotonic")
+    def test_deleted_token_is_noticed_after_ttl(self, mock_monotonic, mock_tools):
+        """Test that a cached positive answer is re-checked once it expires."""
+        mock_monotonic.return_value = 1000.0
+        token_storage = MagicMock()
+        token_storage.get_rhcp_token.return_value = {"offline_token": OFFLINE_TOKEN}
+        config = RHCPConfig(token_storage=token_storage)
+        assert config.get_toolkit("user1") is mock_tools.return_value
+
+        token_storage.get_rhcp_token.return_value = None
+        assert config.is_configured("user1") is True
+
+        mock_monotonic.return_value = 1000.0 + 301.0
+        assert config.is_configured("user1") is False
+        assert "user1" not in config._rhcp_toolkits
+        assert config.get_toolkit("user1") is None
+
+
+class TestInvalidate:
+    """Tests for invalidate()."""
+
+    @patch("agentllm.agents.toolkit_configs.rhcp_config.RHCPTools")
+    def test_forgets_cached_state(self, mock_tools):
+        """Test that a removed token is noticed after invalidation."""
+        token_storage = MagicMock()
+        token_storage.get_rhcp_token.return_value = {"offline_token": OFFLINE_TOKEN}
+        config = RHCPConfig(token_storage=token_storage)
+        assert config.get_toolkit("user1") is mock_tools.return_value
+
+        token_storage.get_rhcp_token.return_value = None
+        config.invalidate("user1")
+
+        assert config.is_configured("user1") is False
+        assert config.get_toolkit("user1") is None
+
+    def test_clears_legacy_token(self):
+        """Test that a legacy in-memory token is dropped."""
+        config = RHCPConfig()
+        config._rhcp_tokens["user1"] = OFFLINE_TOKEN
+        assert config.is_configured("user1") is True
+
+        config.invalidate("user1")
+
+        assert config.is_configured("user1") is False
+
+
+class TestGetToolkit:
+    """Tests for get_toolkit()."""
+
+    @patch("agentllm.agents.toolkit_configs.rhcp_config.RHCPTools")
+    def test_recreates_toolkit_with_one_storage_read(self, mock_tools):
+        """Test that recreating a toolkit reads the token once."""
+        token_storage = MagicMock()
+        token_storage.get_rhcp_token.return_value = {"offline_token": OFFLINE_TOKEN}
+        config = RHCPConfig(token_storage=token_storage)
+
+        assert config.get_toolkit("user1") is mock_tools.return_value
+        token_storage.get_rhcp_token.assert_called_once_with("user1")
+        assert mock_tools.call_args.kwargs["offline_token"] == OFFLINE_TOKEN
+
+    def test_not_configured(self):
+        """Test that no toolkit is returned for a user without a token."""
+        config = RHCPConfig()
+
+        assert config.get_toolkit("user1") is None
+
+    def test_storage_error_returns_none(self):
+        """Test that a failing token lookup is logged and yields no toolkit."""
+        token_storage = MagicMock()
+        token_storage.get_rhcp_token.side_effect = RuntimeError("database is locked")
+        config = RHCPConfig(token_storage=token_storage)
+
+        assert config.get_toolkit("user1") is None
+
+
+class TestGetAgentInstructions:
+    """Tests for get_agent_instructions()."""
+
+    @patch("agentllm.agents.toolkit_configs.rhcp_config.RHCPTools")
+    def test_configured_user_gets_instructions_without_toolkit(self, mock_tools):
+        """Test that instructions only need the configured state, not a toolkit."""
+        token_storage = MagicMock()
+        token_storage.get_rhcp_token.return_value = {"offline_token": OFFLINE_TOKEN}
+        config = RHCPConfig(token_storage=token_storage)
+
+        instructions = config.get_agent_instructions("user1")
+
+        assert instructions[0] == "Red Hat Customer Portal (RHCP) Integration:"
+        mock_tools.assert_not_called()
+
+    def test_unconfigured_user_gets_no_instructions(self):
+        """Test that a user without a token gets no RHCP instructions."""
+        assert RHCPConfig().get_agent_instructions("user1") == []